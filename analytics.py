@@ -0,0 +1,122 @@
+from collections import defaultdict
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from models import db, StatRollup, Skills, Review, Education
+
+BUCKET_LENGTH = StatRollup.__table__.c.bucket.type.length
+
+
+def normalize(value):
+    return ' '.join(value.split()).lower()[:BUCKET_LENGTH]
+
+
+# Each rollup maps a source row to a (bucket, value) pair; a bucket keeps the row count and the sum of values.
+# Values go through int() because pending instances still hold whatever the handler assigned, e.g. "5".
+ROLLUPS = {
+    'skills': (Skills, ('skill_name', 'skill_rating'), lambda name, rating: (normalize(name), int(rating))),
+    'review_months': (Review, ('date_posted', 'rating'),
+                      lambda posted, rating: (posted.strftime('%Y-%m'), int(rating))),
+    'degrees': (Education, ('degree',), lambda degree: (normalize(degree), 0)),
+}
+ROLLUP_MODELS = {model for model, _, _ in ROLLUPS.values()}
+
+
+def contributions(model, values):
+    for name, (source, fields, bucket) in ROLLUPS.items():
+        if source is model:
+            yield (name,) + bucket(*(values[field] for field in fields))
+
+
+def add(deltas, model, values, sign):
+    for name, bucket, value in contributions(model, values):
+        delta = deltas[name, bucket]
+        delta[0] += sign
+        delta[1] += sign * value
+
+
+def _upsert(dialect):
+    table = StatRollup.__table__
+    if dialect == 'mysql':
+        statement = mysql.insert(table)
+        return statement.on_duplicate_key_update(entries=table.c.entries + statement.inserted.entries,
+                                                 total=table.c.total + statement.inserted.total)
+    module = postgresql if dialect == 'postgresql' else sqlite
+    statement = module.insert(table)
+    return statement.on_conflict_do_update(index_elements=['name', 'bucket'],
+                                           set_={'entries': table.c.entries + statement.excluded.entries,
+                                                 'total': table.c.total + statement.excluded.total})
+
+
+def apply_deltas(session, deltas):
+    # Sorted so concurrent writers take bucket row locks in the same order.
+    rows = [{'name': name, 'bucket': bucket, 'entries': entries, 'total': total}
+            for (name, bucket), (entries, total) in sorted(deltas.items()) if entries or total]
+    if rows:
+        session.execute(_upsert(session.get_bind(StatRollup.__mapper__).dialect.name), rows)
+
+
+def apply_rows(session, model, rows, sign=1):
+    # For bulk statements, which never reach the flush events.
+    if model not in ROLLUP_MODELS:
+        return
+    deltas = defaultdict(lambda: [0, 0])
+    for values in rows:
+        add(deltas, model, values, sign)
+    apply_deltas(session, deltas)
+
+
+def _old_values(instance, fields):
+    values = {}
+    for field in fields:
+        history = inspect(instance).attrs[field].history
+        values[field] = (history.deleted or history.unchanged or [getattr(instance, field)])[0]
+    return values
+
+
+def track(session):
+    # Deltas are written inside the flushing transaction, so a rollback takes them back out with the rows.
+    @event.listens_for(session, 'after_flush')
+    def update_rollups(session, flush_context):
+        deltas = defaultdict(lambda: [0, 0])
+        for name, (model, fields, _) in ROLLUPS.items():
+            for instance in session.new:
+                if type(instance) is model:
+                    add(deltas, model, {field: getattr(instance, field) for field in fields}, 1)
+            for instance in session.deleted:
+                if type(instance) is model:
+                    add(deltas, model, _old_values(instance, fields), -1)
+            for instance in session.dirty:
+                if type(instance) is model and any(inspect(instance).attrs[field].history.has_changes()
+                                                   for field in fields):
+                    add(deltas, model, _old_values(instance, fields), -1)
+                    add(deltas, model, {field: getattr(instance, field) for field in fields}, 1)
+        apply_deltas(session, deltas)
+
+
+def rebuild(batch_size=1000):
+    # Recomputes every bucket from the source tables, correcting any drift in the incremental counts.
+    counts = {}
+    for name, (model, fields, bucket) in ROLLUPS.items():
+        totals = defaultdict(lambda: [0, 0])
+        rows = db.session.execute(db.select(*(getattr(model, field) for field in fields))
+                                  .execution_options(yield_per=batch_size))
+        for row in rows:
+            key, value = bucket(*row)
+            totals[key][0] += 1
+            totals[key][1] += value
+        db.session.execute(db.delete(StatRollup).where(StatRollup.name == name))
+        if totals:
+            db.session.execute(db.insert(StatRollup), [
+                {'name': name, 'bucket': key, 'entries': entries, 'total': total}
+                for key, (entries, total) in sorted(totals.items())
+            ])
+        db.session.commit()
+        counts[name] = len(totals)
+    return counts
+
+
+def buckets(name, limit, latest=False):
+    # Reads at most limit rows off an index, independent of how many source rows there are.
+    order = (StatRollup.bucket.desc(),) if latest else (StatRollup.entries.desc(), StatRollup.bucket)
+    return db.session.execute(db.select(StatRollup).where(StatRollup.name == name, StatRollup.entries > 0)
+                              .order_by(*order).limit(limit)).scalars().all()
@@ -1,154 +1,253 @@
-from flask import render_template, url_for, flash, redirect, request, Flask, jsonify
+from flask import Blueprint, Flask, current_app, render_template, url_for, flash, redirect, request, jsonify, send_file, Response, stream_with_context
 from forms import RegistrationForm, LoginForm, RequestResetForm, ResetPasswordForm
-from models import app, db, bcrypt, User, mail, Heading, Education, ProfessionalExperience, Skills, Summary, Event, Blog, Review, Career, Support
+from models import db, migrate, bcrypt, mail, login_manager, user_cache, User, Job, Heading, Education, ProfessionalExperience, Skills, Summary, Event, Blog, Review, Career, Support
 from flask_mail import Message
+from scheduler import ReminderScheduler
+from mailer import MailOutbox
+from cache import ResponseCache
+from conditional import conditional_get
+from renderer import ResumeRenderer, RenderUnavailable, RenderTimeout
+from search import SearchIndex
+from hashing import PasswordHasher, HashingBusy, calibrate_rounds
+from ratelimit import RateLimiter, RateLimited
+from tokens import ResetTokens
+from metrics import Metrics
+from jobs import JobQueue
+from export import FORMATS, export_records, ndjson_lines, json_chunks, export_all
+from importer import read_records, import_records
+import analytics
+from recurrence import occurrences, series_end
+from serialize import FastJSONProvider, Serializer, format_datetime
+from routing import init_replica_routing
+from pagination import InvalidPageRequest, requested_fields, project, paginate, page_response
 from flask_login import login_user, current_user, logout_user, login_required
-import secrets, threading
+from sqlalchemy import or_
+from sqlalchemy.orm import selectinload
+from werkzeug.middleware.proxy_fix import ProxyFix
+import json
+import os
+import secrets
+import warnings
+import weakref
+import click
 import datetime
 from datetime import timedelta
 
+bp = Blueprint('main', __name__, cli_group=None)
+metrics = Metrics()
 
-
-def send_event_reminder(event):
+def send_event_reminder(event, start_time):
     msg = Message('Event Reminder: ' + event.title,
                   sender='hr168074@gmail.com',
                   recipients=[event.user.email])
     msg.body = f'''Reminder for your event:
 Title: {event.title}
 Description: {event.description}
-Start Time: {event.start_time}
-End Time: {event.end_time}
+Start Time: {start_time}
+End Time: {start_time + (event.end_time - event.start_time)}
 
 Please do not reply to this email.
 '''
-    mail.send(msg)
-
-def schedule_reminder(event):
-    reminder_time = event.start_time - timedelta(minutes=30) 
-    delay = (reminder_time - datetime.utcnow()).total_seconds()
-    if delay > 0:
-        threading.Timer(delay, send_event_reminder, args=[event]).start()
+    mail_outbox.enqueue(msg)
+
+mail_outbox = MailOutbox(mail)
+response_cache = ResponseCache()
+resume_renderer = ResumeRenderer()
+password_hasher = PasswordHasher(bcrypt)
+rate_limiter = RateLimiter()
+reset_tokens = ResetTokens(db, User)
+metrics.register_gauge('response_cache_hits', 'Response cache hits in this process.', lambda: response_cache.hits)
+metrics.register_gauge('response_cache_misses', 'Response cache misses in this process.', lambda: response_cache.misses)
+metrics.register_gauge('user_cache_hits', 'Session user loads served from the user cache.', lambda: user_cache.hits)
+metrics.register_gauge('user_cache_misses', 'Session user loads that queried the database.', lambda: user_cache.misses)
+job_queue = JobQueue()
+metrics.register_gauge('jobs_processed', 'Jobs completed by workers in this process.', lambda: job_queue.processed)
+metrics.register_gauge('jobs_failed', 'Job attempts that raised in this process.', lambda: job_queue.failed)
+metrics.register_gauge('jobs_dead', 'Jobs moved to the dead-letter state by this process.', lambda: job_queue.dead)
+search_index = SearchIndex()
+
+SEARCH_DOCUMENTS = {
+    Blog: lambda blog: (blog.user_id, blog.title, blog.content),
+    Review: lambda review: (review.user_id, review.title, review.content),
+    Career: lambda career: (None, career.title, career.description + '\n' + career.requirements)
+}
+search_index.index_on_commit(db.session, SEARCH_DOCUMENTS)
+reminder_scheduler = ReminderScheduler(send_event_reminder)
+
+@bp.before_app_request
+def start_background_workers():
+    mail_outbox.start()
+    job_queue.start()
+    reminder_scheduler.start()
 
 def send_reset_email(user):
     if user:
-        token = secrets.token_hex(16)
-        user.reset_token = token
-        db.session.commit()
+        token = reset_tokens.issue(user)
         msg = Message('Password Reset Request',
                       sender='hr168074@gmail.com',
                       recipients=[user.email])
         msg.body = f'''To reset your password, visit the following link:
-{url_for('reset_token', token=token, _external=True)}
+{url_for('main.reset_token', token=token, _external=True)}
 
 If you did not make this request then simply ignore this email and no changes will be made.
 '''
-        mail.send(msg)
-
-@app.route("/")
+        mail_outbox.enqueue(msg)
+
+@bp.app_errorhandler(InvalidPageRequest)
+def invalid_page_request(error):
+    return jsonify({"message": str(error)}), 400
+
+@bp.before_app_request
+def throttle_writes():
+    if request.method in ('POST', 'PUT', 'DELETE') and current_user.is_authenticated:
+        rate_limiter.hit('write')
+
+@bp.app_errorhandler(RateLimited)
+def rate_limited(error):
+    response = jsonify({"message": str(error)})
+    response.headers['Retry-After'] = str(int(error.retry_after) + 1)
+    return response, 429
+
+@bp.app_errorhandler(HashingBusy)
+def hashing_busy(error):
+    response = jsonify({"message": str(error)})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+@bp.cli.command('calibrate-bcrypt')
+@click.option('--target-ms', default=250, help='Target time for one password hash.')
+def calibrate_bcrypt(target_ms):
+    print(f"BCRYPT_LOG_ROUNDS = {calibrate_rounds(bcrypt, target_ms)}")
+
+@bp.route("/metrics")
+def prometheus_metrics():
+    return metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+@bp.route("/")
 def welcome():
     return "Welcome to the Application!"
 
-@app.route("/home")
+@bp.route("/home")
 @login_required
 def home():
     return render_template('home.html', title='Home')
 
 
-@app.route("/register", methods=['GET', 'POST'])
+@bp.route("/register", methods=['GET', 'POST'])
+@rate_limiter.limit('register')
 def register():
     if current_user.is_authenticated:
-        return redirect(url_for('home'))
+        return redirect(url_for('main.home'))
     form = RegistrationForm()
     if form.validate_on_submit():
-        hashed_password = bcrypt.generate_password_hash(form.password.data).decode('utf-8')
+        hashed_password = password_hasher.hash(form.password.data)
         user = User(name=form.name.data, email=form.email.data, password=hashed_password, role='user')
         db.session.add(user)
         db.session.commit()
         flash('Your account has been created! You are now able to log in', 'success')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
     return render_template('register.html', title='Register', form=form)
 
-@app.route("/login", methods=['GET', 'POST'])
+@bp.route("/login", methods=['GET', 'POST'])
+@rate_limiter.limit('login')
 def login():
     if current_user.is_authenticated:
-        return redirect(url_for('home'))
+        return redirect(url_for('main.home'))
     form = LoginForm()
     if form.validate_on_submit():
         user = User.query.filter_by(email=form.email.data).first()
-        if user and bcrypt.check_password_hash(user.password, form.password.data):
+        if user and password_hasher.check(user.password, form.password.data):
+            if password_hasher.needs_rehash(user.password):
+                user.password = password_hasher.hash(form.password.data)
+                db.session.commit()
             login_user(user, remember=True)
+            user_cache.remember(user)
             flash('Login successful!', 'success')
             next_page = request.args.get('next')
-            return redirect(next_page) if next_page else redirect(url_for('home'))
+            return redirect(next_page) if next_page else redirect(url_for('main.home'))
         else:
             flash('Login Unsuccessful. Please check email and password', 'danger')
     return render_template('login.html', title='Login', form=form)
 
-@app.route("/logout")
+@bp.route("/logout")
 def logout():
+    if current_user.is_authenticated:
+        user_cache.invalidate(current_user.id)
     logout_user()
-    return redirect(url_for('welcome'))
+    return redirect(url_for('main.welcome'))
 
-@app.route("/forgot_password", methods=['GET', 'POST'])
+@bp.route("/forgot_password", methods=['GET', 'POST'])
+@rate_limiter.limit('forgot_password')
 def forgot_password():
     if current_user.is_authenticated:
-        return redirect(url_for('home'))
+        return redirect(url_for('main.home'))
     form = RequestResetForm()
     if form.validate_on_submit():
         user = User.query.filter_by(email=form.email.data).first()
         if user:
             send_reset_email(user)
         flash('An email has been sent with instructions to reset your password.', 'info')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
     return render_template('forgot_password.html', title='Forgot Password', form=form)
 
-@app.route("/reset_password/<token>", methods=['GET', 'POST'])
+@bp.route("/reset_password/<token>", methods=['GET', 'POST'])
 def reset_token(token):
-    user = User.query.filter_by(reset_token=token).first()
+    user = reset_tokens.verify(token)
     if not user:
         flash('That is an invalid or expired token', 'warning')
-        return redirect(url_for('forgot_password'))
+        return redirect(url_for('main.forgot_password'))
     form = ResetPasswordForm()
     if form.validate_on_submit():
-        hashed_password = bcrypt.generate_password_hash(form.password.data).decode('utf-8')
+        hashed_password = password_hasher.hash(form.password.data)
         user.password = hashed_password
-        user.reset_token = None
+        user.revoke_sessions()
         db.session.commit()
         flash('Your password has been updated! You are now able to log in', 'success')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
     return render_template('reset_password.html', title='Reset Password', form=form)
 
-@app.route("/account")
+@bp.route("/account")
 @login_required
 def account():
     user_info = {
         'name': current_user.name,
         'email': current_user.email,
         'role': current_user.role,
-        'logout_link': url_for('logout', _external=True),
-        'account_details_link': url_for('account_details', _external=True)
+        'logout_link': url_for('main.logout', _external=True),
+        'account_details_link': url_for('main.account_details', _external=True)
     }
     return jsonify(user_info)
 
-@app.route("/account_details")
+@bp.route("/account_details")
 @login_required
 def account_details():
     detailed_info = {
         'name': current_user.name,
         'email': current_user.email,
         'role': current_user.role,
-        'heading_link': url_for('manage_heading', _external=True),
-        'education_link': url_for('manage_education', _external=True),
-        'professional_experience_link': url_for('professional_experience', _external=True),
-        'skills_link': url_for('skills', _external=True),
-        'summary_link': url_for('summary', _external=True)
+        'heading_link': url_for('main.manage_heading', _external=True),
+        'education_link': url_for('main.manage_education', _external=True),
+        'professional_experience_link': url_for('main.professional_experience', _external=True),
+        'skills_link': url_for('main.skills', _external=True),
+        'summary_link': url_for('main.summary', _external=True),
+        'resume_link': url_for('main.resume', _external=True)
     }
     return jsonify(detailed_info)
 
 
 
-@app.route("/heading", methods=['GET', 'POST'])
+HEADING_FIELDS = Serializer(Heading, ['first_name', 'last_name', 'profession', 'city', 'country', 'phone_number', 'email'])
+EDUCATION_FIELDS = Serializer(Education, ['id', 'college_name', 'college_location', 'degree', 'field_of_study', 'grade',
+                                          'graduation_year'])
+EXPERIENCE_FIELDS = Serializer(ProfessionalExperience, ['id', 'experience_type', 'company_name', 'company_location',
+                                                        'title', 'start_date', 'end_date', 'currently_work'])
+SKILL_FIELDS = Serializer(Skills, ['id', 'skill_name', 'skill_rating'])
+SUMMARY_FIELDS = Serializer(Summary, ['id', 'content', 'date_created', 'date_updated'])
+
+@bp.route("/heading", methods=['GET', 'POST'])
 @login_required
+@conditional_get(Heading)
+@response_cache.cached_section('heading')
 def manage_heading():
     if request.method == 'POST':
         data = request.get_json()
@@ -169,20 +268,11 @@ def manage_heading():
     elif request.method == 'GET':
         heading = Heading.query.filter_by(user_id=current_user.id).first()
         if heading:
-            heading_info = {
-                'first_name': heading.first_name,
-                'last_name': heading.last_name,
-                'profession': heading.profession,
-                'city': heading.city,
-                'country': heading.country,
-                'phone_number': heading.phone_number,
-                'email': heading.email
-            }
-            return jsonify(heading_info), 200
+            return jsonify(HEADING_FIELDS.encode(heading)), 200
         else:
             return jsonify({"message": "No heading found"}), 404
 
-@app.route("/heading/<int:heading_id>", methods=['PUT', 'DELETE'])
+@bp.route("/heading/<int:heading_id>", methods=['PUT', 'DELETE'])
 @login_required
 def modify_heading(heading_id):
     if request.method == 'PUT':
@@ -213,8 +303,10 @@ def modify_heading(heading_id):
 
 
 
-@app.route("/education", methods=['GET', 'POST'])
+@bp.route("/education", methods=['GET', 'POST'])
 @login_required
+@conditional_get(Education)
+@response_cache.cached_section('education')
 def manage_education():
     if request.method == 'POST':
         data = request.get_json()
@@ -234,20 +326,11 @@ def manage_education():
     elif request.method == 'GET':
         educations = Education.query.filter_by(user_id=current_user.id).all()
         if educations:
-            education_list = [{
-                'id': education.id,
-                'college_name': education.college_name,
-                'college_location': education.college_location,
-                'degree': education.degree,
-                'field_of_study': education.field_of_study,
-                'grade': education.grade,
-                'graduation_year': education.graduation_year
-            } for education in educations]
-            return jsonify(education_list), 200
+            return jsonify(EDUCATION_FIELDS.encode_many(educations)), 200
         else:
             return jsonify({"message": "No education records found"}), 404
 
-@app.route("/education/<int:education_id>", methods=['PUT', 'DELETE'])
+@bp.route("/education/<int:education_id>", methods=['PUT', 'DELETE'])
 @login_required
 def modify_education(education_id):
     if request.method == 'PUT':
@@ -277,8 +360,10 @@ def modify_education(education_id):
 
 
 
-@app.route("/professional_experience", methods=['GET', 'POST', 'PUT', 'DELETE'])
+@bp.route("/professional_experience", methods=['GET', 'POST', 'PUT', 'DELETE'])
 @login_required
+@conditional_get(ProfessionalExperience)
+@response_cache.cached_section('professional_experience')
 def professional_experience():
     if request.method == 'POST':
         data = request.get_json()
@@ -299,20 +384,7 @@ def professional_experience():
     elif request.method == 'GET':
         experiences = ProfessionalExperience.query.filter_by(user_id=current_user.id).all()
         if experiences:
-            experience_list = []
-            for experience in experiences:
-                experience_info = {
-                    'id': experience.id,
-                    'experience_type': experience.experience_type,
-                    'company_name': experience.company_name,
-                    'company_location': experience.company_location,
-                    'title': experience.title,
-                    'start_date': experience.start_date,
-                    'end_date': experience.end_date,
-                    'currently_work': experience.currently_work
-                }
-                experience_list.append(experience_info)
-            return jsonify(experience_list)
+            return jsonify(EXPERIENCE_FIELDS.encode_many(experiences))
         else:
             return jsonify({"message": "No professional experience records found"}), 404
 
@@ -346,8 +418,10 @@ def professional_experience():
 
 
 
-@app.route("/skills", methods=['GET', 'POST', 'PUT', 'DELETE'])
+@bp.route("/skills", methods=['GET', 'POST', 'PUT', 'DELETE'])
 @login_required
+@conditional_get(Skills)
+@response_cache.cached_section('skills')
 def skills():
     if request.method == 'POST':
         data = request.get_json()
@@ -363,15 +437,7 @@ def skills():
     elif request.method == 'GET':
         skills = Skills.query.filter_by(user_id=current_user.id).all()
         if skills:
-            skill_list = []
-            for skill in skills:
-                skill_info = {
-                    'id': skill.id,
-                    'skill_name': skill.skill_name,
-                    'skill_rating': skill.skill_rating
-                }
-                skill_list.append(skill_info)
-            return jsonify(skill_list)
+            return jsonify(SKILL_FIELDS.encode_many(skills))
         else:
             return jsonify({"message": "No skills found"}), 404
 
@@ -381,7 +447,7 @@ def skills():
         if skill:
             skill.skill_name = data['skill_name']
             skill.skill_rating = data['skill_rating']
-            skill.date_updated = datetime.utcnow()
+            skill.date_updated = datetime.datetime.utcnow()
             db.session.commit()
             return jsonify({"message": "Skill updated successfully"}), 200
         else:
@@ -401,8 +467,10 @@ def skills():
 
 
 
-@app.route("/summary", methods=['GET', 'POST', 'PUT', 'DELETE'])
+@bp.route("/summary", methods=['GET', 'POST', 'PUT', 'DELETE'])
 @login_required
+@conditional_get(Summary)
+@response_cache.cached_section('summary')
 def summary():
     if request.method == 'POST':
         data = request.get_json()
@@ -417,13 +485,7 @@ def summary():
     elif request.method == 'GET':
         summary = Summary.query.filter_by(user_id=current_user.id).first()
         if summary:
-            summary_info = {
-                'id': summary.id,
-                'content': summary.content,
-                'date_created': summary.date_created.strftime('%Y-%m-%d %H:%M:%S'),
-                'date_updated': summary.date_updated.strftime('%Y-%m-%d %H:%M:%S')
-            }
-            return jsonify(summary_info)
+            return jsonify(SUMMARY_FIELDS.encode(summary))
         else:
             return jsonify({"message": "No summary found"}), 404
 
@@ -449,46 +511,428 @@ def summary():
 
 
 
-@app.route("/events", methods=['POST'])
+@bp.route("/search", methods=['GET'])
+@login_required
+def search():
+    query = request.args.get('q', '')
+    kinds = request.args.get('kind', 'blog,review,career').split(',')
+    if not query.strip():
+        return jsonify({"message": "q is required"}), 400
+    if any(kind not in ('blog', 'review', 'career') for kind in kinds):
+        return jsonify({"message": "kind must be blog, review or career"}), 400
+    limit = max(1, min(request.args.get('limit', 20, type=int), current_app.config.get('PAGE_SIZE_MAX', 200)))
+    return jsonify(search_index.search(query, current_user.id, kinds, limit)), 200
+
+@bp.cli.command('reindex-search')
+def reindex_search():
+    search_index.clear()
+    for model, document in SEARCH_DOCUMENTS.items():
+        for instance in model.query.yield_per(500):
+            search_index.upsert(model.__tablename__, instance.id, *document(instance))
+    print("Search index rebuilt!")
+
+def stats_limit(default):
+    return max(1, min(request.args.get('limit', default, type=int), current_app.config.get('PAGE_SIZE_MAX', 200)))
+
+@bp.route("/stats/skills", methods=['GET'])
+@login_required
+def skill_stats():
+    return jsonify([{'skill': row.bucket, 'count': row.entries, 'average_rating': round(row.total / row.entries, 2)}
+                    for row in analytics.buckets('skills', stats_limit(20))]), 200
+
+@bp.route("/stats/reviews", methods=['GET'])
+@login_required
+def review_stats():
+    return jsonify([{'month': row.bucket, 'reviews': row.entries, 'average_rating': round(row.total / row.entries, 2)}
+                    for row in analytics.buckets('review_months', stats_limit(12), latest=True)]), 200
+
+@bp.route("/stats/degrees", methods=['GET'])
+@login_required
+def degree_stats():
+    return jsonify([{'degree': row.bucket, 'count': row.entries}
+                    for row in analytics.buckets('degrees', stats_limit(20))]), 200
+
+@job_queue.handler('rebuild_stats')
+def rebuild_stats_job():
+    return analytics.rebuild()
+
+@bp.cli.command('rebuild-stats')
+def rebuild_stats():
+    for name, buckets in analytics.rebuild().items():
+        print(f"{name}: {buckets} buckets")
+
+@bp.route("/cache_stats", methods=['GET'])
+@login_required
+def cache_stats():
+    if current_user.role != 'admin':
+        return jsonify({"message": "Permission denied"}), 403
+    return jsonify(response_cache.stats()), 200
+
+@bp.route("/export", methods=['GET'])
+@login_required
+def export():
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in FORMATS:
+        return jsonify({"message": "format must be ndjson or json"}), 400
+    user_id = request.args.get('user_id', current_user.id, type=int)
+    if user_id != current_user.id and current_user.role != 'admin':
+        return jsonify({"message": "Permission denied"}), 403
+    if db.session.get(User, user_id) is None:
+        return jsonify({"message": "User not found"}), 404
+
+    records = export_records(user_id, current_app.config.get('EXPORT_BATCH_SIZE', 500))
+    chunks = ndjson_lines(records) if fmt == 'ndjson' else json_chunks(records)
+    mimetype = 'application/x-ndjson' if fmt == 'ndjson' else 'application/json'
+    return Response(stream_with_context(chunks), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename=user-{user_id}.{fmt}'})
+
+@bp.route("/import", methods=['POST'])
+@login_required
+def import_resume():
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({"message": "file is required"}), 400
+    fmt = request.args.get('format') or ('csv' if (upload.filename or '').lower().endswith('.csv') else 'json')
+    if fmt not in ('json', 'csv'):
+        return jsonify({"message": "format must be json or csv"}), 400
+
+    upload_dir = current_app.config['IMPORT_UPLOAD_DIR']
+    os.makedirs(upload_dir, exist_ok=True)
+    path = os.path.join(upload_dir, f'{secrets.token_hex(16)}.{fmt}')
+    upload.save(path)
+    # Imports commit chunk by chunk, so a retry would duplicate rows; one attempt only.
+    job = job_queue.enqueue('import_resume', {'path': path, 'fmt': fmt, 'user_id': current_user.id},
+                            max_attempts=1, user_id=current_user.id)
+    response = jsonify({"message": "Import queued", "job_id": job.id})
+    response.headers['Location'] = url_for('main.get_job', job_id=job.id)
+    return response, 202
+
+@job_queue.handler('import_resume')
+def run_import(path, fmt, user_id):
+    def invalidate(touched):
+        for owner, section in touched:
+            response_cache.invalidate(owner, section)
+
+    try:
+        with open(path, encoding='utf-8-sig', newline='') as stream:
+            report = import_records(read_records(stream, fmt), current_app.config.get('IMPORT_BATCH_SIZE', 1000),
+                                    user_id=user_id, max_errors=current_app.config.get('IMPORT_MAX_ERRORS', 1000),
+                                    on_commit=invalidate)
+    finally:
+        os.remove(path)
+    return report.as_dict()
+
+@bp.route("/jobs/<int:job_id>", methods=['GET'])
+@login_required
+def get_job(job_id):
+    job = db.session.get(Job, job_id)
+    if job is None or (job.user_id != current_user.id and current_user.role != 'admin'):
+        return jsonify({"message": "Job not found"}), 404
+    return jsonify({
+        'id': job.id,
+        'name': job.name,
+        'status': job.status,
+        'attempts': job.attempts,
+        'result': json.loads(job.result) if job.result else None,
+        'error': job.last_error.strip().splitlines()[-1] if job.last_error else None
+    }), 200
+
+@bp.cli.command('run-jobs')
+@click.option('--workers', default=None, type=int, help='Worker threads (default: JOB_WORKERS).')
+@click.option('--burst', is_flag=True, help='Exit once no job is due instead of polling forever.')
+def run_jobs(workers, burst):
+    if burst:
+        processed = 0
+        while job_queue.run_once():
+            processed += 1
+        print(f"Processed {processed} jobs")
+        return
+    for thread in job_queue.start(workers or job_queue.workers or 1):
+        thread.join()
+
+@bp.cli.command('retry-jobs')
+@click.argument('job_ids', nargs=-1, type=int)
+def retry_jobs(job_ids):
+    print(f"Requeued {job_queue.retry(list(job_ids))} dead jobs")
+
+@bp.cli.command('job-stats')
+def job_stats():
+    for status, count in sorted(job_queue.stats().items()):
+        print(f"{status}: {count}")
+
+@bp.cli.command('export-users')
+@click.argument('output_dir')
+@click.option('--shards', default=4, show_default=True, help='Parallel worker processes, one output file each.')
+@click.option('--format', 'fmt', type=click.Choice(FORMATS), default='ndjson', show_default=True)
+def export_users(output_dir, shards, fmt):
+    for path, users in export_all(output_dir, shards, fmt, current_app.config.get('EXPORT_BATCH_SIZE', 500)):
+        print(f"{path}: {users} users")
+
+def load_resume(user_id):
+    user = User.query.options(
+        selectinload(User.heading),
+        selectinload(User.educations),
+        selectinload(User.professional_experiences),
+        selectinload(User.skills),
+        selectinload(User.summary)
+    ).filter_by(id=user_id).first()
+    if not user:
+        return None
+
+    heading = user.heading
+    summary = user.summary
+    return {
+        'name': user.name,
+        'email': user.email,
+        'heading': HEADING_FIELDS.encode(heading, ('id',) + HEADING_FIELDS.fields) if heading else None,
+        'education': EDUCATION_FIELDS.encode_many(user.educations),
+        'professional_experience': EXPERIENCE_FIELDS.encode_many(user.professional_experiences),
+        'skills': SKILL_FIELDS.encode_many(user.skills),
+        'summary': SUMMARY_FIELDS.encode(summary) if summary else None
+    }
+
+@bp.route("/resume", methods=['GET'])
+@bp.route("/resume/<int:user_id>", methods=['GET'])
+@login_required
+def resume(user_id=None):
+    if user_id is None:
+        user_id = current_user.id
+    elif user_id != current_user.id and current_user.role != 'admin':
+        return jsonify({"message": "Permission denied"}), 403
+    resume_data = load_resume(user_id)
+    if not resume_data:
+        return jsonify({"message": "User not found"}), 404
+    return jsonify(resume_data), 200
+
+@bp.route("/resume/render", methods=['GET'])
+@login_required
+def render_resume():
+    fmt = request.args.get('format', 'html')
+    template = request.args.get('template', 'classic')
+    if fmt not in ('html', 'pdf'):
+        return jsonify({"message": "format must be html or pdf"}), 400
+    try:
+        path = resume_renderer.render(load_resume(current_user.id), template, fmt)
+    except ValueError as exc:
+        return jsonify({"message": str(exc), "templates": resume_renderer.templates()}), 400
+    except RenderUnavailable as exc:
+        return jsonify({"message": str(exc)}), 501
+    except RenderTimeout as exc:
+        return jsonify({"message": str(exc)}), 503
+    return send_file(path, mimetype='application/pdf' if fmt == 'pdf' else 'text/html',
+                     download_name=f'resume.{fmt}', as_attachment=fmt == 'pdf')
+
+
+
+SECTION_FIELDS = {
+    'heading': (Heading, ['first_name', 'last_name', 'profession', 'city', 'country', 'phone_number', 'email']),
+    'education': (Education, ['college_name', 'college_location', 'degree', 'field_of_study', 'grade', 'graduation_year']),
+    'professional_experience': (ProfessionalExperience, ['experience_type', 'company_name', 'company_location', 'title',
+                                                         'start_date', 'end_date', 'currently_work']),
+    'skills': (Skills, ['skill_name', 'skill_rating']),
+    'summary': (Summary, ['content'])
+}
+
+response_cache.invalidate_on_commit(db.session, {model: section for section, (model, _) in SECTION_FIELDS.items()})
+analytics.track(db.session)
+
+def parse_section_values(model, fields, data):
+    if not isinstance(data, dict):
+        raise TypeError('data must be an object')
+    values = {}
+    for field in fields:
+        value = data[field]
+        if isinstance(value, str) and isinstance(model.__table__.c[field].type, db.DateTime):
+            value = datetime.datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+        values[field] = value
+    return values
+
+@bp.route("/batch", methods=['POST'])
+@login_required
+def batch():
+    data = request.get_json(silent=True)
+    operations = data.get('operations', []) if isinstance(data, dict) else None
+    if not isinstance(operations, list):
+        return jsonify({"message": "Body must be an object with an operations list"}), 400
+    max_operations = current_app.config.get('BATCH_MAX_OPERATIONS', 500)
+    if len(operations) > max_operations:
+        return jsonify({"message": f"At most {max_operations} operations per batch"}), 400
+    results = [None] * len(operations)
+    creates, updates, deletes = {}, {}, {}
+
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            results[index] = {'index': index, 'status': 'error', 'message': 'Operation must be an object'}
+            continue
+        section = operation.get('section')
+        action = operation.get('action')
+        if section not in SECTION_FIELDS:
+            results[index] = {'index': index, 'status': 'error', 'message': f"Unknown section '{section}'"}
+            continue
+        model, fields = SECTION_FIELDS[section]
+        try:
+            if action == 'create':
+                values = parse_section_values(model, fields, operation['data'])
+                values['user_id'] = current_user.id
+                creates.setdefault(model, []).append((index, values))
+            elif action == 'update':
+                values = parse_section_values(model, fields, operation['data'])
+                values['id'] = int(operation['id'])
+                values['date_updated'] = datetime.datetime.utcnow()
+                updates.setdefault(model, []).append((index, values))
+            elif action == 'delete':
+                deletes.setdefault(model, []).append((index, int(operation['id'])))
+            else:
+                results[index] = {'index': index, 'status': 'error', 'message': f"Unknown action '{action}'"}
+        except KeyError as exc:
+            results[index] = {'index': index, 'status': 'error', 'message': f"Missing field {exc}"}
+        except (TypeError, ValueError) as exc:
+            results[index] = {'index': index, 'status': 'error', 'message': str(exc)}
+
+    # Ownership is checked with one query per model rather than one per item.
+    for model in set(updates) | set(deletes):
+        requested = [values['id'] for _, values in updates.get(model, [])] + [item_id for _, item_id in deletes.get(model, [])]
+        owned = {row.id for row in db.session.query(model.id).filter(model.user_id == current_user.id,
+                                                                   model.id.in_(requested))}
+        for index, values in updates.get(model, []):
+            if values['id'] not in owned:
+                results[index] = {'index': index, 'status': 'error', 'message': 'Record not found'}
+        for index, item_id in deletes.get(model, []):
+            if item_id not in owned:
+                results[index] = {'index': index, 'status': 'error', 'message': 'Record not found'}
+        updates[model] = [(index, values) for index, values in updates.get(model, []) if values['id'] in owned]
+        deletes[model] = [(index, item_id) for index, item_id in deletes.get(model, []) if item_id in owned]
+
+    try:
+        # Bulk statements skip the flush events, so rollups get the old rows out and the new ones in here.
+        for model in analytics.ROLLUP_MODELS & (set(updates) | set(deletes)):
+            changed = [values['id'] for _, values in updates[model]] + [item_id for _, item_id in deletes[model]]
+            if changed:
+                old_rows = db.session.execute(db.select(model.__table__).where(model.id.in_(changed))).mappings()
+                analytics.apply_rows(db.session, model, old_rows, -1)
+                analytics.apply_rows(db.session, model, [values for _, values in updates[model]])
+        for model, items in creates.items():
+            db.session.execute(db.insert(model), [values for _, values in items])
+            analytics.apply_rows(db.session, model, [values for _, values in items])
+            for index, _ in items:
+                results[index] = {'index': index, 'status': 'created'}
+        for model, items in updates.items():
+            if items:
+                db.session.execute(db.update(model), [values for _, values in items])
+            for index, values in items:
+                results[index] = {'index': index, 'status': 'updated', 'id': values['id']}
+        for model, items in deletes.items():
+            if items:
+                db.session.execute(db.delete(model).where(model.user_id == current_user.id,
+                                                          model.id.in_([item_id for _, item_id in items])))
+            for index, item_id in items:
+                results[index] = {'index': index, 'status': 'deleted', 'id': item_id}
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception('Batch write failed')
+        return jsonify({"message": "Batch failed, no changes were applied"}), 400
+
+    # Bulk statements bypass the flush, so the commit hook never sees these rows.
+    for section, (model, _) in SECTION_FIELDS.items():
+        if creates.get(model) or updates.get(model) or deletes.get(model):
+            response_cache.invalidate(current_user.id, section)
+
+    return jsonify({"results": results}), 200
+
+
+
+def parse_event_time(value):
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD or YYYY-MM-DD HH:MM:SS")
+
+def set_event_recurrence(event, rule):
+    if rule:
+        event.recurrence = rule.strip().upper()
+        event.series_end = series_end(event.start_time, event.recurrence)
+    else:
+        event.recurrence = None
+        event.series_end = None
+
+@bp.route("/events", methods=['POST'])
 @login_required
 def create_event():
     data = request.get_json()
     new_event = Event(
         title=data['title'],
         description=data.get('description', ''),
-        start_time=datetime.strptime(data['start_time'], '%Y-%m-%d %H:%M:%S'),
-        end_time=datetime.strptime(data['end_time'], '%Y-%m-%d %H:%M:%S'),
+        start_time=datetime.datetime.strptime(data['start_time'], '%Y-%m-%d %H:%M:%S'),
+        end_time=datetime.datetime.strptime(data['end_time'], '%Y-%m-%d %H:%M:%S'),
         user_id=current_user.id
     )
+    try:
+        set_event_recurrence(new_event, data.get('recurrence'))
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
     db.session.add(new_event)
     db.session.commit()
-    schedule_reminder(new_event)
+    reminder_scheduler.plan(new_event)
     return jsonify({"message": "Event created successfully"}), 201
 
-@app.route("/events", methods=['GET'])
+EVENT_FIELDS = Serializer(Event, ['id', 'title', 'description', 'start_time', 'end_time', 'recurrence'])
+
+def expand_events(user_id, window_start, window_end):
+    single = Event.query.filter(Event.user_id == user_id,
+                                Event.recurrence.is_(None),
+                                Event.start_time >= window_start,
+                                Event.start_time < window_end)
+    for event in single:
+        yield event, event.start_time
+    series = Event.query.filter(Event.user_id == user_id,
+                                Event.recurrence.isnot(None),
+                                Event.start_time < window_end,
+                                or_(Event.series_end.is_(None), Event.series_end >= window_start))
+    for event in series:
+        for start_time in occurrences(event.start_time, event.recurrence, window_start, window_end):
+            yield event, start_time
+
+@bp.route("/events", methods=['GET'])
 @login_required
 def get_events():
+    fields = requested_fields(EVENT_FIELDS)
     date_str = request.args.get('date')
-    if date_str:
-        date = datetime.strptime(date_str, '%Y-%m-%d')
-        start_of_day = datetime(date.year, date.month, date.day)
-        end_of_day = start_of_day + timedelta(days=1)
-        events = Event.query.filter(Event.user_id == current_user.id,
-                                    Event.start_time >= start_of_day,
-                                    Event.start_time < end_of_day).all()
-    else:
-        events = Event.query.filter_by(user_id=current_user.id).all()
-    
-    events_list = [{
-        'id': event.id,
-        'title': event.title,
-        'description': event.description,
-        'start_time': event.start_time.strftime('%Y-%m-%d %H:%M:%S'),
-        'end_time': event.end_time.strftime('%Y-%m-%d %H:%M:%S')
-    } for event in events]
-    return jsonify(events_list), 200
-
-@app.route("/events/<int:event_id>", methods=['PUT'])
+    start_str = request.args.get('start')
+    if date_str or start_str:
+        try:
+            if date_str:
+                window_start = parse_event_time(date_str)
+                window_end = window_start + timedelta(days=1)
+            else:
+                window_start = parse_event_time(start_str)
+                window_end = parse_event_time(request.args.get('end', '')) if request.args.get('end') \
+                    else window_start + timedelta(days=1)
+        except ValueError as exc:
+            return jsonify({"message": str(exc)}), 400
+        if window_end <= window_start or window_end - window_start > timedelta(days=current_app.config.get('EVENT_RANGE_MAX_DAYS', 92)):
+            return jsonify({"message": "Invalid or too large date range"}), 400
+
+        # Recurring series are expanded only inside the window, so cost doesn't grow with the series length.
+        encode = EVENT_FIELDS.encoder(fields)
+        occurrences_list = []
+        for event, start_time in sorted(expand_events(current_user.id, window_start, window_end), key=lambda item: (item[1], item[0].id)):
+            occurrence = encode(event)
+            if 'start_time' in occurrence:
+                occurrence['start_time'] = format_datetime(start_time)
+            if 'end_time' in occurrence:
+                occurrence['end_time'] = format_datetime(start_time + (event.end_time - event.start_time))
+            occurrences_list.append(occurrence)
+        return jsonify(occurrences_list), 200
+
+    events = Event.query.filter_by(user_id=current_user.id)
+    events = project(events, Event, fields, Event.start_time)
+    events, next_cursor = paginate(events, Event.start_time, Event.id)
+    return page_response(events, EVENT_FIELDS, fields, next_cursor), 200
+
+@bp.route("/events/<int:event_id>", methods=['PUT'])
 @login_required
 def update_event(event_id):
     data = request.get_json()
@@ -497,12 +941,18 @@ def update_event(event_id):
         return jsonify({"message": "Permission denied"}), 403
     event.title = data['title']
     event.description = data.get('description', '')
-    event.start_time = datetime.strptime(data['start_time'], '%Y-%m-%d %H:%M:%S')
-    event.end_time = datetime.strptime(data['end_time'], '%Y-%m-%d %H:%M:%S')
+    event.start_time = datetime.datetime.strptime(data['start_time'], '%Y-%m-%d %H:%M:%S')
+    event.end_time = datetime.datetime.strptime(data['end_time'], '%Y-%m-%d %H:%M:%S')
+    try:
+        set_event_recurrence(event, data.get('recurrence'))
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+    event.reminded_start = None
     db.session.commit()
+    reminder_scheduler.plan(event)
     return jsonify({"message": "Event updated successfully"}), 200
 
-@app.route("/events/<int:event_id>", methods=['DELETE'])
+@bp.route("/events/<int:event_id>", methods=['DELETE'])
 @login_required
 def delete_event(event_id):
     event = Event.query.get_or_404(event_id)
@@ -510,11 +960,12 @@ def delete_event(event_id):
         return jsonify({"message": "Permission denied"}), 403
     db.session.delete(event)
     db.session.commit()
+    reminder_scheduler.cancel(event_id)
     return jsonify({"message": "Event deleted successfully"}), 200
 
 
 
-@app.route("/blogs", methods=['POST'])
+@bp.route("/blogs", methods=['POST'])
 @login_required
 def create_blog():
     data = request.get_json()
@@ -527,33 +978,25 @@ def create_blog():
     db.session.commit()
     return jsonify({"message": "Blog created successfully"}), 201
 
-@app.route("/blogs", methods=['GET'])
+BLOG_FIELDS = Serializer(Blog, ['id', 'title', 'content', 'date_posted'])
+
+@bp.route("/blogs", methods=['GET'])
 @login_required
 def get_blogs():
-    blogs = Blog.query.filter_by(user_id=current_user.id).all()
-    blogs_list = [{
-        'id': blog.id,
-        'title': blog.title,
-        'content': blog.content,
-        'date_posted': blog.date_posted.strftime('%Y-%m-%d %H:%M:%S')
-    } for blog in blogs]
-    return jsonify(blogs_list), 200
+    fields = requested_fields(BLOG_FIELDS)
+    blogs = project(Blog.query.filter_by(user_id=current_user.id), Blog, fields, Blog.date_posted)
+    blogs, next_cursor = paginate(blogs, Blog.date_posted, Blog.id, descending=True)
+    return page_response(blogs, BLOG_FIELDS, fields, next_cursor), 200
 
-@app.route("/blogs/<int:blog_id>", methods=['GET'])
+@bp.route("/blogs/<int:blog_id>", methods=['GET'])
 @login_required
 def get_blog(blog_id):
     blog = Blog.query.get_or_404(blog_id)
     if blog.user_id != current_user.id:
         return jsonify({"message": "Permission denied"}), 403
-    blog_data = {
-        'id': blog.id,
-        'title': blog.title,
-        'content': blog.content,
-        'date_posted': blog.date_posted.strftime('%Y-%m-%d %H:%M:%S')
-    }
-    return jsonify(blog_data), 200
+    return jsonify(BLOG_FIELDS.encode(blog)), 200
 
-@app.route("/blogs/<int:blog_id>", methods=['PUT'])
+@bp.route("/blogs/<int:blog_id>", methods=['PUT'])
 @login_required
 def update_blog(blog_id):
     data = request.get_json()
@@ -565,7 +1008,7 @@ def update_blog(blog_id):
     db.session.commit()
     return jsonify({"message": "Blog updated successfully"}), 200
 
-@app.route("/blogs/<int:blog_id>", methods=['DELETE'])
+@bp.route("/blogs/<int:blog_id>", methods=['DELETE'])
 @login_required
 def delete_blog(blog_id):
     blog = Blog.query.get_or_404(blog_id)
@@ -577,7 +1020,7 @@ def delete_blog(blog_id):
 
 
 
-@app.route("/reviews", methods=['POST'])
+@bp.route("/reviews", methods=['POST'])
 @login_required
 def create_review():
     data = request.get_json()
@@ -591,35 +1034,25 @@ def create_review():
     db.session.commit()
     return jsonify({"message": "Review created successfully"}), 201
 
-@app.route("/reviews", methods=['GET'])
+REVIEW_FIELDS = Serializer(Review, ['id', 'title', 'content', 'rating', 'date_posted'])
+
+@bp.route("/reviews", methods=['GET'])
 @login_required
 def get_reviews():
-    reviews = Review.query.filter_by(user_id=current_user.id).all()
-    reviews_list = [{
-        'id': review.id,
-        'title': review.title,
-        'content': review.content,
-        'rating': review.rating,
-        'date_posted': review.date_posted.strftime('%Y-%m-%d %H:%M:%S')
-    } for review in reviews]
-    return jsonify(reviews_list), 200
-
-@app.route("/reviews/<int:review_id>", methods=['GET'])
+    fields = requested_fields(REVIEW_FIELDS)
+    reviews = project(Review.query.filter_by(user_id=current_user.id), Review, fields, Review.date_posted)
+    reviews, next_cursor = paginate(reviews, Review.date_posted, Review.id, descending=True)
+    return page_response(reviews, REVIEW_FIELDS, fields, next_cursor), 200
+
+@bp.route("/reviews/<int:review_id>", methods=['GET'])
 @login_required
 def get_review(review_id):
     review = Review.query.get_or_404(review_id)
     if review.user_id != current_user.id:
         return jsonify({"message": "Permission denied"}), 403
-    review_data = {
-        'id': review.id,
-        'title': review.title,
-        'content': review.content,
-        'rating': review.rating,
-        'date_posted': review.date_posted.strftime('%Y-%m-%d %H:%M:%S')
-    }
-    return jsonify(review_data), 200
+    return jsonify(REVIEW_FIELDS.encode(review)), 200
 
-@app.route("/reviews/<int:review_id>", methods=['PUT'])
+@bp.route("/reviews/<int:review_id>", methods=['PUT'])
 @login_required
 def update_review(review_id):
     data = request.get_json()
@@ -632,7 +1065,7 @@ def update_review(review_id):
     db.session.commit()
     return jsonify({"message": "Review updated successfully"}), 200
 
-@app.route("/reviews/<int:review_id>", methods=['DELETE'])
+@bp.route("/reviews/<int:review_id>", methods=['DELETE'])
 @login_required
 def delete_review(review_id):
     review = Review.query.get_or_404(review_id)
@@ -644,8 +1077,11 @@ def delete_review(review_id):
 
 
 
-@app.route("/career", methods=['GET', 'POST', 'PUT', 'DELETE'])
+CAREER_FIELDS = Serializer(Career, ['id', 'title', 'description', 'requirements', 'location', 'date_created', 'date_updated'])
+
+@bp.route("/career", methods=['GET', 'POST', 'PUT', 'DELETE'])
 @login_required
+@conditional_get(Career, per_user=False)
 def career():
     if request.method == 'POST':
         data = request.get_json()
@@ -660,21 +1096,11 @@ def career():
         return jsonify({"message": "Career created successfully"}), 201
 
     elif request.method == 'GET':
-        careers = Career.query.all()
+        fields = requested_fields(CAREER_FIELDS)
+        careers = project(Career.query, Career, fields, Career.id)
+        careers, next_cursor = paginate(careers, Career.id, Career.id)
         if careers:
-            career_list = []
-            for career in careers:
-                career_info = {
-                    'id': career.id,
-                    'title': career.title,
-                    'description': career.description,
-                    'requirements': career.requirements,
-                    'location': career.location,
-                    'date_created': career.date_created.strftime('%Y-%m-%d %H:%M:%S'),
-                    'date_updated': career.date_updated.strftime('%Y-%m-%d %H:%M:%S')
-                }
-                career_list.append(career_info)
-            return jsonify(career_list)
+            return page_response(careers, CAREER_FIELDS, fields, next_cursor)
         else:
             return jsonify({"message": "No careers found"}), 404
 
@@ -704,8 +1130,11 @@ def career():
 
 
 
-@app.route("/support", methods=['GET', 'POST', 'PUT', 'DELETE'])
+SUPPORT_FIELDS = Serializer(Support, ['id', 'issue', 'description', 'status', 'date_created', 'date_updated'])
+
+@bp.route("/support", methods=['GET', 'POST', 'PUT', 'DELETE'])
 @login_required
+@conditional_get(Support)
 def support():
     if request.method == 'POST':
         data = request.get_json()
@@ -720,20 +1149,11 @@ def support():
         return jsonify({"message": "Support ticket created successfully"}), 201
 
     elif request.method == 'GET':
-        supports = Support.query.filter_by(user_id=current_user.id).all()
+        fields = requested_fields(SUPPORT_FIELDS)
+        supports = project(Support.query.filter_by(user_id=current_user.id), Support, fields, Support.id)
+        supports, next_cursor = paginate(supports, Support.id, Support.id)
         if supports:
-            support_list = []
-            for support in supports:
-                support_info = {
-                    'id': support.id,
-                    'issue': support.issue,
-                    'description': support.description,
-                    'status': support.status,
-                    'date_created': support.date_created.strftime('%Y-%m-%d %H:%M:%S'),
-                    'date_updated': support.date_updated.strftime('%Y-%m-%d %H:%M:%S')
-                }
-                support_list.append(support_info)
-            return jsonify(support_list)
+            return page_response(supports, SUPPORT_FIELDS, fields, next_cursor)
         else:
             return jsonify({"message": "No support tickets found"}), 404
 
@@ -762,5 +1182,56 @@ def support():
 
 
 
+def load_secret_key(app):
+    # Without SECRET_KEY every worker would sign sessions differently; a key file shared through the
+    # instance folder keeps single-host deployments consistent. Production should set the variable.
+    path = os.path.join(app.instance_path, 'secret_key')
+    os.makedirs(app.instance_path, exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass
+    else:
+        with os.fdopen(fd, 'w') as f:
+            f.write(secrets.token_hex(32))
+        warnings.warn(f'SECRET_KEY is not set; generated one at {path}')
+    with open(path) as f:
+        return f.read().strip()
+
+def dispose_engines():
+    # Connections opened by a preloading master must not be shared with forked workers.
+    for app in list(created_apps):
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+
+created_apps = weakref.WeakSet()
+os.register_at_fork(after_in_child=dispose_engines)
+
+def create_app(config='config.Config'):
+    app = Flask(__name__)
+    app.config.from_object(config)
+    if not app.config.get('SECRET_KEY'):
+        app.config['SECRET_KEY'] = load_secret_key(app)
+    app.json = FastJSONProvider(app)
+    if app.config.get('TRUSTED_PROXIES'):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXIES'])
+
+    db.init_app(app)
+    init_replica_routing(app, db)
+    migrate.init_app(app, db)
+    bcrypt.init_app(app)
+    mail.init_app(app)
+    login_manager.init_app(app)
+    user_cache.init_app(app)
+    metrics.init_app(app)
+    for extension in (mail_outbox, response_cache, resume_renderer, password_hasher, rate_limiter, reset_tokens,
+                      job_queue, search_index, reminder_scheduler):
+        extension.init_app(app)
+    job_queue.every('rebuild_stats', app.config.get('STATS_REBUILD_SECONDS', 6 * 3600))
+    app.register_blueprint(bp)
+    created_apps.add(app)
+    return app
+
 if __name__ == '__main__':
-    app.run(debug=True)
+    create_app().run(debug=True)
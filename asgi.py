@@ -0,0 +1,7 @@
+from a2wsgi import WSGIMiddleware
+from app import create_app
+
+# The event loop owns sockets, keep-alive and request bodies; a handler only holds one of the
+# ASGI_THREADS pool threads while it runs, so idle or slow clients no longer pin a thread each.
+app = create_app()
+application = WSGIMiddleware(app, workers=app.config.get('ASGI_THREADS', 32))
@@ -0,0 +1,37 @@
+import argparse
+import json
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two bench/run.py result files.')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Percent change in throughput or p95 that counts as a regression.')
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    print(f"{'workload':15s} {'rps':>22s} {'p95 ms':>24s}")
+    regressions = 0
+    for name, before in baseline['workloads'].items():
+        after = candidate['workloads'].get(name)
+        if after is None:
+            continue
+        rps_change = (after['throughput_rps'] - before['throughput_rps']) / before['throughput_rps'] * 100
+        p95_change = (after['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+        flag = ''
+        if rps_change < -args.threshold or p95_change > args.threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f"{name:15s} {before['throughput_rps']:8.1f} -> {after['throughput_rps']:8.1f} ({rps_change:+5.1f}%) "
+              f"{before['p95_ms']:8.2f} -> {after['p95_ms']:8.2f} ({p95_change:+5.1f}%){flag}")
+    print(f"{baseline['revision']} -> {candidate['revision']}: {regressions} regression(s)")
+    raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
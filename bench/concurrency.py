@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from run import git_revision, percentile
+
+SERVERS = {
+    'wsgi': lambda port: [sys.executable, '-c', 'from werkzeug.serving import run_simple; from app import create_app; '
+                                                f'run_simple("127.0.0.1", {port}, create_app(), threaded=True)'],
+    'asgi': lambda port: [sys.executable, '-m', 'uvicorn', 'asgi:application', '--host', '127.0.0.1',
+                          '--port', str(port), '--log-level', 'warning'],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def process_status(pid):
+    status = {}
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                if name in ('Threads', 'VmRSS'):
+                    status[name] = int(value.split()[0])
+    except OSError:
+        pass
+    return {'threads': status.get('Threads'), 'rss_kb': status.get('VmRSS')}
+
+
+async def fetch(reader, writer, path):
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n'.encode('ascii'))
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    keep_alive = True
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        if name.lower() == b'content-length':
+            length = int(value)
+        elif name.lower() == b'connection' and value.strip().lower() == b'close':
+            keep_alive = False
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def client(port, path, deadline, timeout, latencies, errors):
+    connection = None
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), timeout)
+            status, keep_alive = await asyncio.wait_for(fetch(*connection, path), timeout)
+            if status >= 500:
+                errors.append(status)
+            else:
+                latencies.append(time.perf_counter() - started)
+            if not keep_alive:
+                connection[1].close()
+                connection = None
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as exc:
+            errors.append(type(exc).__name__)
+            if connection is not None:
+                connection[1].close()
+                connection = None
+            await asyncio.sleep(0.05)
+    if connection is not None:
+        connection[1].close()
+
+
+async def hold_idle(port, count, opened):
+    # Idle keep-alive connections cost a thread each under a thread-per-connection server.
+    for _ in range(count):
+        try:
+            opened.append(await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), 2))
+        except (OSError, asyncio.TimeoutError):
+            break
+
+
+async def measure(port, pid, path, connections, idle, duration, timeout):
+    idle_connections = []
+    await hold_idle(port, idle, idle_connections)
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    tasks = [asyncio.create_task(client(port, path, deadline, timeout, latencies, errors)) for _ in range(connections)]
+    await asyncio.sleep(duration / 2)
+    status = process_status(pid)
+    await asyncio.gather(*tasks)
+    for _, writer in idle_connections:
+        writer.close()
+    report = {'connections': connections, 'idle_connections': len(idle_connections), 'requests': len(latencies),
+              'throughput_rps': len(latencies) / duration, 'errors': len(errors), **status}
+    for key, fraction in (('p50_ms', 0.50), ('p99_ms', 0.99)):
+        value = percentile(latencies, fraction)
+        report[key] = value * 1000 if value is not None else None
+    return report
+
+
+def wait_for_port(port, process, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited during startup: {' '.join(process.args)}")
+        try:
+            socket.create_connection(('127.0.0.1', port), 0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('server did not start')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent connection capacity of one server process, WSGI vs ASGI.')
+    parser.add_argument('modes', nargs='*', default=list(SERVERS), help=f"Any of: {', '.join(SERVERS)}.")
+    parser.add_argument('--levels', default='50,200,1000', help='Comma-separated active connection counts.')
+    parser.add_argument('--idle', type=int, default=0, help='Extra idle keep-alive connections held open.')
+    parser.add_argument('--path', default='/')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--timeout', type=float, default=5.0, help='Per-request timeout, counted as an error.')
+    parser.add_argument('--output', help='Result file (default: bench/results/<timestamp>-<rev>-concurrency.json).')
+    args = parser.parse_args()
+    unknown = [mode for mode in args.modes if mode not in SERVERS]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+    levels = [int(level) for level in args.levels.split(',')]
+
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+    env.setdefault('RATELIMIT_ENABLED', '0')
+    env.setdefault('JOB_WORKERS', '0')
+    subprocess.run([sys.executable, 'create_db.py'], cwd=ROOT_DIR, env=env, check=True, stdout=subprocess.DEVNULL)
+
+    results = {'revision': git_revision(), 'timestamp': datetime.utcnow().isoformat(), 'path': args.path,
+               'duration': args.duration, 'modes': {}}
+    for mode in args.modes:
+        port = free_port()
+        process = subprocess.Popen(SERVERS[mode](port), cwd=ROOT_DIR, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(port, process)
+            results['modes'][mode] = []
+            for connections in levels:
+                report = asyncio.run(measure(port, process.pid, args.path, connections, args.idle,
+                                             args.duration, args.timeout))
+                results['modes'][mode].append(report)
+                print(f"{mode:5s} {connections:6d} conns {report['throughput_rps']:9.1f} req/s  "
+                      f"p50 {report['p50_ms'] or 0:8.2f} ms  p99 {report['p99_ms'] or 0:8.2f} ms  "
+                      f"errors {report['errors']:6d}  threads {report['threads']}  rss {report['rss_kb']} kB")
+        finally:
+            process.terminate()
+            process.wait()
+
+    output = args.output or os.path.join(BENCH_DIR, 'results', f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-"
+                                                               f"{results['revision']}-concurrency.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HOT_QUERIES = {
+    'events_for_day': (
+        "SELECT * FROM event WHERE user_id = :user_id AND start_time >= :start AND start_time < :end",
+        ['ix_event_user_id_start_time']
+    ),
+    'blogs_newest_first': (
+        "SELECT id, title, date_posted FROM blog WHERE user_id = :user_id ORDER BY date_posted DESC, id DESC LIMIT 50",
+        ['ix_blog_user_id_date_posted']
+    ),
+    'reviews_newest_first': (
+        "SELECT id, title, rating, date_posted FROM review WHERE user_id = :user_id ORDER BY date_posted DESC, id DESC LIMIT 50",
+        ['ix_review_user_id_date_posted']
+    ),
+}
+
+
+def seed(db, users, rows_per_user):
+    from models import User, Event, Blog, Review
+    now = datetime.utcnow()
+    db.session.execute(db.insert(User), [
+        {'id': i, 'name': f'user{i}', 'email': f'user{i}@example.com', 'password': 'x' * 60,
+         'role': 'user'}
+        for i in range(1, users + 1)
+    ])
+    for model in (Event, Blog, Review):
+        batch = []
+        for user_id in range(1, users + 1):
+            for _ in range(rows_per_user):
+                stamp = now - timedelta(minutes=random.randint(0, 60 * 24 * 365))
+                if model is Event:
+                    batch.append({'title': 'event', 'description': 'd', 'start_time': stamp,
+                                  'end_time': stamp + timedelta(hours=1), 'user_id': user_id})
+                elif model is Blog:
+                    batch.append({'title': 'blog', 'content': 'c' * 200, 'date_posted': stamp, 'user_id': user_id})
+                else:
+                    batch.append({'title': 'review', 'content': 'c' * 200, 'rating': random.randint(1, 5),
+                                  'date_posted': stamp, 'user_id': user_id})
+        db.session.execute(db.insert(model), batch)
+    db.session.commit()
+
+
+def measure(db, sql, params, repeat):
+    plan = db.session.execute(db.text('EXPLAIN QUERY PLAN ' + sql), params).fetchall()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        db.session.execute(db.text(sql), params).fetchall()
+    elapsed = (time.perf_counter() - started) / repeat
+    return [row[-1] for row in plan], elapsed * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare query plans for hot queries with and without the declared indexes.')
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--rows-per-user', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + path
+    from app import create_app
+    from models import db
+    app = create_app()
+
+    with app.app_context():
+        db.create_all()
+        seed(db, args.users, args.rows_per_user)
+        params = {'user_id': args.users // 2, 'start': datetime.utcnow() - timedelta(days=30), 'end': datetime.utcnow()}
+
+        declared = {index.name: index for table in db.metadata.tables.values() for index in table.indexes}
+        for name, (sql, indexes) in HOT_QUERIES.items():
+            # The baseline drops every index leading with user_id on the table, not just the one under test,
+            # so the planner can't fall back to a sibling index and hide the plan change.
+            tables = {declared[index].table for index in indexes}
+            baseline = [index for table in tables for index in table.indexes
+                        if index.expressions[0].name == 'user_id']
+            db.session.commit()
+            for index in baseline:
+                index.drop(db.engine)
+            without_plan, without_ms = measure(db, sql, params, args.repeat)
+            db.session.commit()
+            for index in baseline:
+                index.create(db.engine)
+            with_plan, with_ms = measure(db, sql, params, args.repeat)
+            db.session.commit()
+            print(name)
+            print(f'  with index:    {with_ms:8.3f} ms  {"; ".join(with_plan)}')
+            print(f'  without index: {without_ms:8.3f} ms  {"; ".join(without_plan)}')
+
+
+if __name__ == '__main__':
+    main()
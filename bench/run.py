@@ -0,0 +1,238 @@
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+CSRF_PATTERN = re.compile(r'name="csrf_token" type="hidden" value="([^"]+)"')
+
+
+class TestClientSession:
+    def __init__(self, app):
+        self.app = app
+        self.reset()
+
+    def reset(self):
+        self.client = self.app.test_client()
+
+    def request(self, method, path, data=None, json_body=None):
+        response = self.client.open(path, method=method, data=data, json=json_body)
+        return response.status_code, response.get_data(as_text=True)
+
+
+class HttpSession:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.reset()
+
+    def reset(self):
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()),
+                                                  NoRedirect())
+
+    def request(self, method, path, data=None, json_body=None):
+        headers = {}
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        elif data is not None:
+            body = urllib.parse.urlencode(data).encode('utf-8')
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        request = urllib.request.Request(self.base_url + path, data=body, method=method, headers=headers)
+        try:
+            with self.opener.open(request) as response:
+                return response.status, response.read().decode('utf-8')
+        except urllib.error.HTTPError as error:
+            return error.code, error.read().decode('utf-8')
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def login(session, user_id, password):
+    status, body = session.request('GET', '/login')
+    match = CSRF_PATTERN.search(body)
+    form = {'email': f'bench{user_id}@example.com', 'password': password}
+    if match:
+        form['csrf_token'] = match.group(1)
+    status, _ = session.request('POST', '/login', data=form)
+    return status
+
+
+def login_storm(session, rng, user_ids, password):
+    def fresh_login():
+        # A logged-in session would be redirected away from /login without checking the password.
+        session.reset()
+        return login(session, rng.choice(user_ids), password)
+    return [('login', fresh_login)]
+
+
+def resume_read(session, rng, user_ids, password):
+    return [('resume', lambda: session.request('GET', '/resume')[0]),
+            ('skills', lambda: session.request('GET', '/skills')[0]),
+            ('education', lambda: session.request('GET', '/education')[0])]
+
+
+def blog_write(session, rng, user_ids, password):
+    def write():
+        return session.request('POST', '/blogs', json_body={
+            'title': f'Bench post {rng.randint(0, 10 ** 6)}', 'content': 'lorem ipsum ' * rng.randint(20, 200)})[0]
+    return [('create_blog', write), ('list_blogs', lambda: session.request('GET', '/blogs?limit=20')[0])]
+
+
+def event_listing(session, rng, user_ids, password):
+    def by_day():
+        day = datetime.utcnow() + timedelta(days=rng.randint(-90, 90))
+        return session.request('GET', '/events?date=' + day.strftime('%Y-%m-%d'))[0]
+    def by_range():
+        start = datetime.utcnow() + timedelta(days=rng.randint(-90, 90))
+        return session.request('GET', f"/events?start={start.strftime('%Y-%m-%d')}"
+                                      f"&end={(start + timedelta(days=30)).strftime('%Y-%m-%d')}")[0]
+    return [('events_by_day', by_day), ('events_by_range', by_range)]
+
+
+WORKLOADS = {
+    'login_storm': (login_storm, False),
+    'resume_read': (resume_read, True),
+    'blog_write': (blog_write, True),
+    'event_listing': (event_listing, True),
+}
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_workload(name, make_session, user_ids, password, threads, duration, seed):
+    build, needs_login = WORKLOADS[name]
+    latencies = {}
+    errors = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        session = make_session()
+        if needs_login:
+            login(session, rng.choice(user_ids), password)
+        operations = build(session, rng, user_ids, password)
+        local = {}
+        local_errors = {}
+        while time.perf_counter() < deadline:
+            operation, call = rng.choice(operations)
+            started = time.perf_counter()
+            status = call()
+            local.setdefault(operation, []).append(time.perf_counter() - started)
+            if status >= 500 or status == 429:
+                local_errors[operation] = local_errors.get(operation, 0) + 1
+        with lock:
+            for operation, values in local.items():
+                latencies.setdefault(operation, []).extend(values)
+            for operation, count in local_errors.items():
+                errors[operation] = errors.get(operation, 0) + count
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    report = {'requests': len(all_latencies), 'seconds': elapsed,
+              'throughput_rps': len(all_latencies) / elapsed if elapsed else 0,
+              'errors': sum(errors.values()), 'operations': {}}
+    for label, values in [('all', all_latencies)] + sorted(latencies.items()):
+        stats = {'count': len(values)}
+        for key, fraction in (('p50_ms', 0.50), ('p95_ms', 0.95), ('p99_ms', 0.99)):
+            value = percentile(values, fraction)
+            stats[key] = value * 1000 if value is not None else None
+        if label == 'all':
+            report.update(stats)
+        else:
+            stats['errors'] = errors.get(label, 0)
+            report['operations'][label] = stats
+    return report
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run scripted workloads and report throughput and latency percentiles.')
+    parser.add_argument('workloads', nargs='*', default=list(WORKLOADS), help=f"Any of: {', '.join(WORKLOADS)}.")
+    parser.add_argument('--base-url', help='Benchmark a running server instead of the in-process app.')
+    parser.add_argument('--users', type=int, default=200, help='Users to seed for the in-process run.')
+    parser.add_argument('--per-user', type=int, default=20)
+    parser.add_argument('--user-ids', help='Range of existing bench user ids for --base-url, e.g. 1-1000.')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Result file (default: bench/results/<timestamp>-<rev>.json).')
+    args = parser.parse_args()
+    unknown = [name for name in args.workloads if name not in WORKLOADS]
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(unknown)}")
+
+    from seed import BENCH_PASSWORD
+    if args.base_url:
+        first, last = (int(part) for part in (args.user_ids or '1-1').split('-'))
+        user_ids = list(range(first, last + 1))
+        make_session = lambda: HttpSession(args.base_url)
+        target = args.base_url
+    else:
+        if 'DATABASE_URL' not in os.environ:
+            os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+        os.environ.setdefault('RATELIMIT_ENABLED', '0')
+        from seed import seed
+        from app import create_app
+        app = create_app()
+        from models import db
+        with app.app_context():
+            db.create_all()
+            user_ids = seed(db, args.users, args.per_user, args.seed)
+        make_session = lambda: TestClientSession(app)
+        target = os.environ['DATABASE_URL'].split('@')[-1]
+
+    results = {'revision': git_revision(), 'timestamp': datetime.utcnow().isoformat(), 'target': target,
+               'threads': args.threads, 'duration': args.duration, 'workloads': {}}
+    for name in args.workloads:
+        report = run_workload(name, make_session, user_ids, BENCH_PASSWORD, args.threads, args.duration, args.seed)
+        results['workloads'][name] = report
+        print(f"{name:15s} {report['throughput_rps']:9.1f} req/s  p50 {report['p50_ms'] or 0:7.2f} ms  "
+              f"p95 {report['p95_ms'] or 0:7.2f} ms  p99 {report['p99_ms'] or 0:7.2f} ms  errors {report['errors']}")
+
+    output = args.output or os.path.join(BENCH_DIR, 'results',
+                                         f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
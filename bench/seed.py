@@ -0,0 +1,113 @@
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_PASSWORD = 'benchpass'
+CHUNK_SIZE = 5000
+
+WORDS = ('python flask resume career engineer design data cloud product team project lead build scale '
+         'deliver customer research quality system service platform mobile web growth analytics').split()
+SKILLS = ['Python', 'SQL', 'Flask', 'Docker', 'Kubernetes', 'React', 'Go', 'Java', 'AWS', 'Terraform',
+          'Communication', 'Leadership', 'Excel', 'Figma', 'Rust', 'C++', 'Spark', 'Pandas']
+DEGREES = ['BSc', 'BA', 'MSc', 'MBA', 'PhD', 'BEng', 'MEng']
+FIELDS = ['Computer Science', 'Mathematics', 'Economics', 'Physics', 'Design', 'Business']
+CITIES = ['London', 'Berlin', 'Delhi', 'Toronto', 'Austin', 'Singapore', 'Sydney']
+
+
+def text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def user_rows(rng, user_id, now, per_user):
+    rows = {
+        'education': [],
+        'professional_experience': [],
+        'skills': [],
+        'event': [],
+        'blog': [],
+        'review': [],
+    }
+    for _ in range(rng.randint(1, 3)):
+        rows['education'].append({
+            'college_name': f'{rng.choice(CITIES)} University', 'college_location': rng.choice(CITIES),
+            'degree': rng.choice(DEGREES), 'field_of_study': rng.choice(FIELDS),
+            'grade': str(rng.randint(60, 100)), 'graduation_year': str(rng.randint(1995, 2025)),
+            'user_id': user_id, 'date_created': now, 'date_updated': now})
+    for _ in range(rng.randint(1, 5)):
+        start = now - timedelta(days=rng.randint(100, 5000))
+        rows['professional_experience'].append({
+            'experience_type': rng.choice(['Full-time', 'Contract', 'Internship']),
+            'company_name': f'{rng.choice(WORDS).title()} Ltd', 'company_location': rng.choice(CITIES),
+            'title': f'{rng.choice(WORDS).title()} Engineer', 'start_date': start,
+            'end_date': start + timedelta(days=rng.randint(90, 1500)), 'currently_work': False,
+            'user_id': user_id, 'date_created': now, 'date_updated': now})
+    for skill in rng.sample(SKILLS, rng.randint(3, 10)):
+        rows['skills'].append({'skill_name': skill, 'skill_rating': rng.randint(1, 5),
+                               'user_id': user_id, 'date_created': now, 'date_updated': now})
+    for _ in range(per_user):
+        start = now + timedelta(minutes=rng.randint(-60 * 24 * 90, 60 * 24 * 90))
+        rows['event'].append({'title': text(rng, 3), 'description': text(rng, 12), 'start_time': start,
+                              'end_time': start + timedelta(hours=1), 'reminded_start': start if start < now else None,
+                              'user_id': user_id})
+        rows['blog'].append({'title': text(rng, 5), 'content': text(rng, 300),
+                             'date_posted': now - timedelta(minutes=rng.randint(0, 60 * 24 * 365)),
+                             'user_id': user_id})
+        rows['review'].append({'title': text(rng, 4), 'content': text(rng, 60), 'rating': rng.randint(1, 5),
+                               'date_posted': now - timedelta(minutes=rng.randint(0, 60 * 24 * 365)),
+                               'user_id': user_id})
+    return rows
+
+
+def seed(db, users, per_user, seed_value=0):
+    from models import User, Education, ProfessionalExperience, Skills, Event, Blog, Review
+    from flask_bcrypt import generate_password_hash
+    models = {'education': Education, 'professional_experience': ProfessionalExperience, 'skills': Skills,
+              'event': Event, 'blog': Blog, 'review': Review}
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    # One low-cost hash shared by every bench user keeps seeding fast; logins still run a real bcrypt check.
+    password = generate_password_hash(BENCH_PASSWORD, 4).decode('utf-8')
+    first_id = (db.session.query(db.func.max(User.id)).scalar() or 0) + 1
+
+    for start in range(first_id, first_id + users, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, first_id + users)
+        db.session.execute(db.insert(User), [
+            {'id': user_id, 'name': f'Bench User {user_id}', 'email': f'bench{user_id}@example.com',
+             'password': password, 'role': 'user'}
+            for user_id in range(start, stop)])
+        pending = {name: [] for name in models}
+        for user_id in range(start, stop):
+            for name, rows in user_rows(rng, user_id, now, per_user).items():
+                pending[name].extend(rows)
+        for name, rows in pending.items():
+            for offset in range(0, len(rows), CHUNK_SIZE):
+                db.session.execute(db.insert(models[name]), rows[offset:offset + CHUNK_SIZE])
+        db.session.commit()
+    return list(range(first_id, first_id + users))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Seed the configured database (DATABASE_URL) with synthetic bench users.')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--per-user', type=int, default=20, help='Events, blogs and reviews per user.')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    from app import create_app
+    from models import db
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        user_ids = seed(db, args.users, args.per_user, args.seed)
+        print(f'Seeded {len(user_ids)} users in {time.perf_counter() - started:.1f}s '
+              f'(password: {BENCH_PASSWORD}, emails bench<id>@example.com)')
+
+
+if __name__ == '__main__':
+    main()
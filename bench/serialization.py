@@ -0,0 +1,65 @@
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def legacy_event_fields():
+    return {
+        'id': lambda event: event.id,
+        'title': lambda event: event.title,
+        'description': lambda event: event.description,
+        'start_time': lambda event: event.start_time.strftime('%Y-%m-%d %H:%M:%S'),
+        'end_time': lambda event: event.end_time.strftime('%Y-%m-%d %H:%M:%S'),
+        'recurrence': lambda event: event.recurrence
+    }
+
+
+def build_events(count):
+    from models import Event
+    now = datetime.utcnow()
+    return [Event(id=index, title=f'Event {index}', description='lorem ipsum ' * 10,
+                  start_time=now + timedelta(hours=index), end_time=now + timedelta(hours=index + 1),
+                  recurrence=None, user_id=1)
+            for index in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-row cost of hand-built dicts versus generated encoders.')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    from serialize import Serializer, dumps, orjson
+    from models import Event
+    events = build_events(args.rows)
+    legacy = legacy_event_fields()
+    fields = list(legacy)
+    encoder = Serializer(Event, fields)
+
+    def legacy_encode():
+        return [{field: legacy[field](event) for field in fields} for event in events]
+
+    def encoder_encode():
+        return encoder.encode_many(events)
+
+    assert legacy_encode() == encoder_encode()
+    cases = [
+        ('dict building', legacy_encode),
+        ('generated encoder', encoder_encode),
+        ('dict building + json', lambda: json.dumps(legacy_encode(), sort_keys=True, separators=(',', ':'))),
+        ('generated encoder + ' + ('orjson' if orjson else 'json'), lambda: dumps(encoder_encode(), sort_keys=True)),
+    ]
+    print(f'{args.rows} Event rows, best of {args.repeat} x {args.number}')
+    for label, call in cases:
+        best = min(timeit.repeat(call, repeat=args.repeat, number=args.number)) / args.number
+        print(f'{label:32s} {best / args.rows * 1e6:8.2f} us/row')
+
+
+if __name__ == '__main__':
+    main()
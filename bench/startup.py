@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from run import git_revision
+
+PHASES = ('import_ms', 'create_app_ms', 'first_request_ms', 'second_request_ms')
+
+
+def timed_request(client, path):
+    started = time.perf_counter()
+    response = client.get(path)
+    response.close()
+    if response.status_code >= 500:
+        raise RuntimeError(f'{path} returned {response.status_code}')
+    return (time.perf_counter() - started) * 1000
+
+
+def probe(mode, path):
+    # Runs in a fresh interpreter so module imports and template compilation are really cold.
+    sys.path.insert(0, ROOT_DIR)
+    started = time.perf_counter()
+    import app as appmod
+    imported = time.perf_counter()
+    app = appmod.create_app()
+    created = time.perf_counter()
+    report = {'import_ms': (imported - started) * 1000, 'create_app_ms': (created - imported) * 1000}
+    if mode == 'cold':
+        client = app.test_client()
+        report['first_request_ms'] = timed_request(client, path)
+        report['second_request_ms'] = timed_request(client, path)
+        return report
+
+    # preload: warm the app the way a gunicorn master would, then measure a freshly forked worker.
+    import gc
+    timed_request(app.test_client(), path)
+    gc.freeze()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        client = app.test_client()
+        child = {'first_request_ms': timed_request(client, path), 'second_request_ms': timed_request(client, path)}
+        os.write(write_fd, json.dumps(child).encode())
+        os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        data = f.read()
+    os.waitpid(pid, 0)
+    report.update(json.loads(data))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import, create_app and first-request latency of a fresh process.')
+    parser.add_argument('modes', nargs='*', default=['cold', 'preload'],
+                        help='cold: a new process serves its first request; preload: a worker forked from a warm master.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--path', default='/login')
+    parser.add_argument('--output', help='Result file (default: bench/results/<timestamp>-<rev>-startup.json).')
+    parser.add_argument('--probe', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.probe:
+        print(json.dumps(probe(args.probe, args.path)))
+        return
+    unknown = [mode for mode in args.modes if mode not in ('cold', 'preload')]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+    env.setdefault('RATELIMIT_ENABLED', '0')
+    env.setdefault('JOB_WORKERS', '0')
+    env.setdefault('SECRET_KEY', 'bench')
+    subprocess.run([sys.executable, 'create_db.py'], cwd=ROOT_DIR, env=env, check=True, stdout=subprocess.DEVNULL)
+
+    results = {'revision': git_revision(), 'timestamp': datetime.utcnow().isoformat(), 'path': args.path,
+               'runs': args.runs, 'modes': {}}
+    for mode in args.modes:
+        samples = []
+        for _ in range(args.runs):
+            output = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--probe', mode,
+                                              '--path', args.path], cwd=ROOT_DIR, env=env)
+            samples.append(json.loads(output.decode().strip().splitlines()[-1]))
+        report = {phase: statistics.median(sample[phase] for sample in samples) for phase in PHASES}
+        results['modes'][mode] = report
+        print(f"{mode:8s} import {report['import_ms']:7.1f} ms  create_app {report['create_app_ms']:7.1f} ms  "
+              f"first request {report['first_request_ms']:7.2f} ms  second {report['second_request_ms']:6.2f} ms")
+
+    output = args.output or os.path.join(BENCH_DIR, 'results', f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-"
+                                                               f"{results['revision']}-startup.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
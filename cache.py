@@ -0,0 +1,237 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import g, request, make_response
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+
+
+class LRUCache:
+    def __init__(self, max_entries=10000, max_bytes=64 * 1024 * 1024, ttl=300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_bytes = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, size = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, size):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, size)
+            self.size_bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key):
+        self.size_bytes -= self._entries.pop(key)[2]
+
+    def stats(self):
+        return {'entries': len(self._entries), 'bytes': self.size_bytes, 'evictions': self.evictions}
+
+
+class RedisCache:
+    def __init__(self, url, ttl=300):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get(self, key):
+        value = self.client.get(self._key(key))
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key, value, size):
+        self.client.setex(self._key(key), self.ttl, pickle.dumps(value))
+
+    def delete(self, key):
+        self.client.delete(self._key(key))
+
+    def _key(self, key):
+        return 'resume-cache:%s:%s' % key
+
+    def stats(self):
+        return {'entries': self.client.dbsize()}
+
+
+class ResponseCache:
+    def __init__(self, app=None):
+        self.backend = None
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get('CACHE_BACKEND', 'memory')
+        ttl = app.config.get('CACHE_TTL_SECONDS', 300)
+        if backend == 'redis':
+            self.backend = RedisCache(app.config['CACHE_REDIS_URL'], ttl=ttl)
+        elif backend == 'memory':
+            self.backend = LRUCache(max_entries=app.config.get('CACHE_MAX_ENTRIES', 10000),
+                                    max_bytes=app.config.get('CACHE_MAX_BYTES', 64 * 1024 * 1024),
+                                    ttl=ttl)
+        else:
+            self.backend = None
+
+    def get(self, user_id, section, version):
+        if self.backend is None:
+            return None
+        value = self.backend.get((user_id, section))
+        if value is None or value[0] != version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value[1:]
+
+    def set(self, user_id, section, version, value, size):
+        if self.backend is not None:
+            self.backend.set((user_id, section), (version,) + value, size)
+
+    def invalidate(self, user_id, section):
+        if self.backend is not None:
+            self.backend.delete((user_id, section))
+
+    def stats(self):
+        stats = {'hits': self.hits, 'misses': self.misses}
+        if self.backend is not None:
+            stats.update(self.backend.stats())
+        return stats
+
+    def cached_section(self, section):
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                # Entries are tagged with the version conditional_get computed from the table, so a write made
+                # by another worker, or committed while this response rendered, makes the entry a miss.
+                version = g.get('resource_version')
+                if request.method != 'GET' or version is None:
+                    return view(*args, **kwargs)
+                cached = self.get(current_user.id, section, version)
+                if cached is not None:
+                    body, status, mimetype = cached
+                    return make_response(body, status, {'Content-Type': mimetype})
+                response = make_response(view(*args, **kwargs))
+                if response.status_code in (200, 404):
+                    body = response.get_data()
+                    self.set(current_user.id, section, version, (body, response.status_code, response.mimetype),
+                             len(body))
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate_on_commit(self, session, sections):
+        # Freshness comes from the entry version; this only frees entries this process knows are superseded.
+        @event.listens_for(session, 'after_flush')
+        def collect(session, flush_context):
+            pending = session.info.setdefault('cache_invalidations', set())
+            for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+                section = sections.get(type(instance))
+                if section is not None and instance.user_id is not None:
+                    pending.add((instance.user_id, section))
+
+        @event.listens_for(session, 'after_commit')
+        def invalidate(session):
+            for user_id, section in session.info.pop('cache_invalidations', ()):
+                self.invalidate(user_id, section)
+
+        @event.listens_for(session, 'after_rollback')
+        def discard(session):
+            session.info.pop('cache_invalidations', None)
+
+
+class UserCache:
+    FIELDS = ('id', 'name', 'email', 'role', 'auth_version')
+
+    def __init__(self, db, model, app=None):
+        self.db = db
+        self.model = model
+        self.backend = None
+        self.hits = 0
+        self.misses = 0
+        self._invalidate_on_commit(db.session)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get('USER_CACHE_BACKEND', app.config.get('CACHE_BACKEND', 'memory'))
+        ttl = app.config.get('USER_CACHE_TTL_SECONDS', 30)
+        if backend == 'redis':
+            self.backend = RedisCache(app.config['CACHE_REDIS_URL'], ttl=ttl)
+        elif backend == 'memory':
+            self.backend = LRUCache(max_entries=app.config.get('USER_CACHE_MAX_ENTRIES', 10000), ttl=ttl)
+        else:
+            self.backend = None
+
+    def remember(self, user):
+        self._store(user)
+
+    def _store(self, user):
+        snapshot = {field: getattr(user, field) for field in self.FIELDS}
+        if self.backend is not None:
+            self.backend.set(('user', user.id), snapshot, 256)
+        return snapshot
+
+    def load(self, user_id, version):
+        snapshot = self.backend.get(('user', user_id)) if self.backend is not None else None
+        if snapshot is not None and snapshot.get('auth_version') == version:
+            self.hits += 1
+        else:
+            # A mismatch may only mean this worker missed another worker's invalidation, so the database decides.
+            self.misses += 1
+            user = self.db.session.get(self.model, user_id, populate_existing=True)
+            if user is None:
+                return None
+            snapshot = self._store(user)
+
+        # A password reset or role change bumps auth_version, which signs out sessions carrying the old one.
+        if snapshot['auth_version'] != version:
+            return None
+
+        user = self.model(**{field: snapshot[field] for field in self.FIELDS})
+        # Detached rather than transient: anything not in the snapshot raises instead of reading as None.
+        make_transient_to_detached(user)
+        return user
+
+    def invalidate(self, user_id):
+        if self.backend is not None:
+            self.backend.delete(('user', user_id))
+
+    def _invalidate_on_commit(self, db_session):
+        @event.listens_for(db_session, 'after_flush')
+        def collect(db_session, flush_context):
+            pending = db_session.info.setdefault('user_invalidations', set())
+            for instance in list(db_session.dirty) + list(db_session.deleted):
+                if isinstance(instance, self.model):
+                    pending.add(instance.id)
+
+        @event.listens_for(db_session, 'after_commit')
+        def invalidate(db_session):
+            for user_id in db_session.info.pop('user_invalidations', ()):
+                self.invalidate(user_id)
+
+        @event.listens_for(db_session, 'after_rollback')
+        def discard(db_session):
+            db_session.info.pop('user_invalidations', None)
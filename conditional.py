@@ -0,0 +1,42 @@
+import hashlib
+from functools import wraps
+from flask import g, request, make_response
+from flask_login import current_user
+from sqlalchemy import func
+from models import db
+
+
+def resource_version(model, per_user=True):
+    # One aggregate row instead of the full result set: deletes change the count/id sum, and every update bumps
+    # the revision sum even when date_updated lands in the same second.
+    query = db.session.query(func.max(model.date_updated), func.count(model.id), func.coalesce(func.sum(model.id), 0),
+                             func.coalesce(func.sum(model.revision), 0))
+    if per_user:
+        query = query.filter(model.user_id == current_user.id)
+    return query.one()
+
+
+def conditional_get(model, per_user=True):
+    # Only ETags are used: a delete leaves max(date_updated) unchanged, so Last-Modified alone can't see it.
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+            last_modified, count, id_sum, revisions = resource_version(model, per_user)
+            owner = current_user.id if per_user else ''
+            fingerprint = (f'{model.__tablename__}:{owner}:{last_modified}:{count}:{id_sum}:{revisions}:'
+                           f'{request.query_string.decode()}')
+            etag = hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()
+
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+            else:
+                g.resource_version = etag
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            return response
+        return wrapper
+    return decorator
@@ -1,5 +1,8 @@
-from models import db, app
+from flask_migrate import stamp
+from app import create_app
+from models import db
 
-with app.app_context():
+with create_app().app_context():
     db.create_all()
+    stamp()
     print("Database tables created!")
@@ -0,0 +1,88 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from serialize import dumps
+from models import db, User, Heading, Education, ProfessionalExperience, Skills, Summary, Event, Blog, Review, Support
+
+EXPORT_MODELS = (Heading, Education, ProfessionalExperience, Skills, Summary, Event, Blog, Review, Support)
+USER_COLUMNS = ('id', 'name', 'email', 'role')
+FORMATS = ('ndjson', 'json')
+
+
+def export_records(user_id, batch_size=500):
+    # Plain Core rows with yield_per stream from a server-side cursor and never enter the identity map.
+    user = db.session.execute(
+        db.select(*(User.__table__.c[name] for name in USER_COLUMNS)).where(User.id == user_id)
+    ).mappings().first()
+    if user is None:
+        return
+    yield 'user', dict(user)
+    for model in EXPORT_MODELS:
+        table = model.__table__
+        rows = db.session.execute(
+            db.select(table).where(table.c.user_id == user_id).order_by(table.c.id)
+            .execution_options(yield_per=batch_size)
+        ).mappings()
+        for row in rows:
+            yield model.__tablename__, dict(row)
+
+
+def ndjson_lines(records):
+    for kind, row in records:
+        yield dumps({'type': kind, 'data': row}) + '\n'
+
+
+def json_chunks(records):
+    current = None
+    for kind, row in records:
+        if kind == 'user':
+            yield '{"user":' + dumps(row)
+            continue
+        if kind != current:
+            yield (']' if current else '') + f',"{kind}":['
+            current = kind
+        else:
+            yield ','
+        yield dumps(row)
+    yield (']' if current else '') + '}\n'
+
+
+def shard_user_ids(shard, shards, batch_size):
+    # Keyset batches instead of one open cursor, so per-user queries never interleave with an unbuffered result.
+    last_id = 0
+    while True:
+        user_ids = db.session.execute(
+            db.select(User.id).where(User.id > last_id, User.id % shards == shard).order_by(User.id).limit(batch_size)
+        ).scalars().all()
+        if not user_ids:
+            return
+        yield from user_ids
+        last_id = user_ids[-1]
+
+
+def export_shard(shard, shards, output_dir, fmt, batch_size):
+    path = os.path.join(output_dir, f'export-{shard:03d}-of-{shards:03d}.{fmt}')
+    users = 0
+    from app import create_app
+    # Each worker process builds its own app, so it gets its own connections rather than sharing the parent's pool.
+    with create_app().app_context(), open(path + '.tmp', 'w') as f:
+        if fmt == 'json':
+            f.write('[')
+        for user_id in shard_user_ids(shard, shards, batch_size):
+            records = export_records(user_id, batch_size)
+            if fmt == 'json':
+                f.write(',' if users else '')
+                f.writelines(json_chunks(records))
+            else:
+                f.writelines(dumps({'type': kind, 'user_id': user_id, 'data': row}) + '\n' for kind, row in records)
+            users += 1
+        if fmt == 'json':
+            f.write(']\n')
+    os.replace(path + '.tmp', path)
+    return path, users
+
+
+def export_all(output_dir, shards=4, fmt='ndjson', batch_size=500):
+    os.makedirs(output_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=shards) as pool:
+        futures = [pool.submit(export_shard, shard, shards, output_dir, fmt, batch_size) for shard in range(shards)]
+        return [future.result() for future in futures]
@@ -0,0 +1,20 @@
+# gunicorn -c gunicorn.conf.py "app:create_app()"
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('WEB_THREADS', 4))
+# Bound to loopback, so requests arrive through a reverse proxy; rate limits need the client address it forwards.
+os.environ.setdefault('TRUSTED_PROXIES', '1')
+
+# The master imports the app once; workers fork from it and share the loaded modules, compiled
+# templates and encoders copy-on-write instead of each repeating the import.
+preload_app = True
+
+
+def when_ready(server):
+    # Objects alive now are moved out of the collector's reach, so its passes in the workers don't
+    # write to their headers and unshare the pages they live on.
+    gc.freeze()
@@ -0,0 +1,56 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class HashingBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    def __init__(self, bcrypt, app=None):
+        self.bcrypt = bcrypt
+        self._pool = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        workers = app.config.get('BCRYPT_WORKERS') or os.cpu_count() or 2
+        # bcrypt releases the GIL while hashing, so threads give real parallelism here.
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(workers + app.config.get('BCRYPT_MAX_PENDING', 4 * workers))
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy('Too many password operations in progress')
+        try:
+            return self._pool.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._submit(self.bcrypt.generate_password_hash, password, self.rounds).decode('utf-8')
+
+    def check(self, password_hash, password):
+        return self._submit(self.bcrypt.check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+
+def calibrate_rounds(bcrypt, target_ms, min_rounds=4, max_rounds=16):
+    # Picks the highest cost whose hash time stays within the target on this machine.
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        started = time.perf_counter()
+        bcrypt.generate_password_hash('calibration-password', rounds)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms > target_ms:
+            break
+        chosen = rounds
+    return chosen
@@ -0,0 +1,39 @@
+import argparse
+import json
+import sys
+from importer import read_records, import_records
+from app import create_app
+from models import User
+
+
+def main():
+    app = create_app()
+    parser = argparse.ArgumentParser(description='Import resume sections from JSON Resume documents or CSV.')
+    parser.add_argument('path', help="File to import, or '-' for stdin.")
+    parser.add_argument('--format', choices=('json', 'csv'), help='Defaults to csv for .csv files, json otherwise.')
+    parser.add_argument('--user-email', help="Import everything for this user instead of each record's user_email.")
+    parser.add_argument('--batch-size', type=int, default=app.config.get('IMPORT_BATCH_SIZE', 1000))
+    parser.add_argument('--max-errors', type=int, default=app.config.get('IMPORT_MAX_ERRORS', 1000),
+                        help='Errors kept in the report; later ones are only counted.')
+    args = parser.parse_args()
+    fmt = args.format or ('csv' if args.path.lower().endswith('.csv') else 'json')
+
+    with app.app_context():
+        user_id = None
+        if args.user_email:
+            user = User.query.filter_by(email=args.user_email).first()
+            if user is None:
+                parser.error(f'no user with email {args.user_email}')
+            user_id = user.id
+        stream = sys.stdin if args.path == '-' else open(args.path, encoding='utf-8-sig', newline='')
+        with stream:
+            report = import_records(read_records(stream, fmt), args.batch_size, user_id, args.max_errors)
+        for error in report.errors:
+            print(json.dumps(error), file=sys.stderr)
+        print(f"Imported {report.imported} records, {report.failed} failed"
+              + (' (error list truncated)' if report.failed > len(report.errors) else ''))
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,308 @@
+import csv
+import json
+from datetime import datetime
+from sqlalchemy.exc import SQLAlchemyError
+import analytics
+from models import db, User, Heading, Education, ProfessionalExperience, Skills, Summary
+
+IMPORT_MODELS = {
+    'heading': Heading,
+    'education': Education,
+    'professional_experience': ProfessionalExperience,
+    'skills': Skills,
+    'summary': Summary,
+}
+SINGLE_SECTIONS = ('heading', 'summary')
+SKIPPED_COLUMNS = ('id', 'user_id', 'date_created', 'date_updated', 'revision')
+DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d', '%Y-%m', '%Y')
+SKILL_LEVELS = {'beginner': 1, 'novice': 1, 'basic': 2, 'intermediate': 3, 'advanced': 4, 'expert': 5, 'master': 5}
+MAX_DOCUMENT_CHARS = 1024 * 1024
+
+
+class RecordError(ValueError):
+    pass
+
+
+def parse_date(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    raise RecordError(f"Invalid date '{value}'")
+
+
+def validate(model, data):
+    # Constraints come straight from the column definitions, so the importer can't drift from the schema.
+    values = {}
+    for column in model.__table__.columns:
+        if column.name in SKIPPED_COLUMNS:
+            continue
+        value = data.get(column.name)
+        column_type = column.type
+        if value == '' and not isinstance(column_type, db.String):
+            value = None
+        if value is None:
+            if not column.nullable and column.default is None:
+                raise RecordError(f"{column.name} is required")
+            continue
+        if isinstance(column_type, db.Boolean):
+            if isinstance(value, str):
+                if value.lower() not in ('true', 'false', '1', '0', 'yes', 'no'):
+                    raise RecordError(f"{column.name} must be a boolean")
+                value = value.lower() in ('true', '1', 'yes')
+            value = bool(value)
+        elif isinstance(column_type, db.Integer):
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise RecordError(f"{column.name} must be an integer")
+        elif isinstance(column_type, db.DateTime):
+            if not isinstance(value, datetime):
+                value = parse_date(str(value))
+        else:
+            value = str(value)
+            if column_type.length is not None and len(value) > column_type.length:
+                raise RecordError(f"{column.name} is longer than {column_type.length} characters")
+        values[column.name] = value
+    return values
+
+
+def iter_documents(stream, chunk_size=64 * 1024):
+    # Decodes one JSON document at a time from NDJSON, a top-level array or a single document,
+    # so memory is bounded by the largest document rather than the file.
+    decoder = json.JSONDecoder()
+    buffer = ''
+    eof = False
+    while True:
+        buffer = buffer.lstrip(' \t\r\n,[]')
+        if buffer:
+            try:
+                document, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError as exc:
+                if eof or len(buffer) > MAX_DOCUMENT_CHARS:
+                    raise RecordError(f"Malformed JSON document: {exc.msg}")
+            else:
+                buffer = buffer[end:]
+                yield document
+                continue
+        if eof:
+            return
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+def _work(work):
+    return {
+        'experience_type': work.get('type', 'Full-time'), 'company_name': work.get('name'),
+        'company_location': work.get('location', ''), 'title': work.get('position'),
+        'start_date': work.get('startDate'), 'end_date': work.get('endDate'),
+        'currently_work': not work.get('endDate'),
+    }
+
+
+def _education(education):
+    return {
+        'college_name': education.get('institution'), 'college_location': education.get('location', ''),
+        'degree': education.get('studyType'), 'field_of_study': education.get('area'),
+        'grade': education.get('score', ''), 'graduation_year': str(education.get('endDate') or '')[:4],
+    }
+
+
+def _skill(skill):
+    level = skill.get('level')
+    return {'skill_name': skill.get('name'),
+            'skill_rating': SKILL_LEVELS.get(str(level).lower(), level) if level else None}
+
+
+JSON_RESUME_LISTS = (
+    ('work', 'professional_experience', _work),
+    ('education', 'education', _education),
+    ('skills', 'skills', _skill),
+)
+
+
+def _object(value):
+    return value if isinstance(value, dict) else {}
+
+
+def json_resume_sections(document):
+    # Anything that isn't the expected shape becomes an error item (section None), never an exception,
+    # so one odd document can't abort the rest of the file.
+    basics = document.get('basics') or {}
+    if not isinstance(basics, dict):
+        yield None, {'error': 'basics must be an object'}
+        basics = {}
+    location = basics.get('location') or {}
+    if not isinstance(location, dict):
+        yield None, {'error': 'basics.location must be an object'}
+        location = {}
+    if basics:
+        first_name, _, last_name = str(basics.get('name') or '').partition(' ')
+        yield 'heading', {
+            'first_name': first_name, 'last_name': last_name, 'profession': basics.get('label'),
+            'city': location.get('city'), 'country': location.get('countryCode') or location.get('region'),
+            'phone_number': basics.get('phone'), 'email': basics.get('email'),
+        }
+        if basics.get('summary'):
+            yield 'summary', {'content': basics['summary']}
+    for key, section, convert in JSON_RESUME_LISTS:
+        entries = document.get(key) or []
+        if not isinstance(entries, list):
+            yield None, {'error': f'{key} must be a list'}
+            continue
+        for entry in entries:
+            if isinstance(entry, dict):
+                yield section, convert(entry)
+            else:
+                yield None, {'error': f'{key} entries must be objects'}
+
+
+def json_resume_records(stream):
+    documents = iter_documents(stream)
+    number = 0
+    while True:
+        number += 1
+        try:
+            document = next(documents)
+        except StopIteration:
+            return
+        except RecordError as exc:
+            yield f'document {number}', None, {'error': str(exc)}, None
+            return
+        if not isinstance(document, dict):
+            yield f'document {number}', None, {'error': 'Document must be a JSON object'}, None
+            continue
+        user_email = _object(document.get('meta')).get('user_email') or _object(document.get('basics')).get('email')
+        if not isinstance(user_email, str):
+            user_email = None
+        for index, (section, data) in enumerate(json_resume_sections(document)):
+            yield f'document {number} item {index + 1}', section, data, user_email
+
+
+def csv_records(stream):
+    reader = csv.DictReader(stream)
+    for data in reader:
+        # An empty cell means the field is missing, not an empty string.
+        data = {name: value if value != '' else None for name, value in data.items()}
+        yield f'line {reader.line_num}', data.pop('section', None), data, data.pop('user_email', None)
+
+
+class ImportReport:
+    def __init__(self, max_errors=1000):
+        self.max_errors = max_errors
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+
+    def error(self, ref, section, message):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'record': ref, 'section': section, 'message': message})
+
+    def as_dict(self):
+        return {'imported': self.imported, 'failed': self.failed, 'errors': self.errors,
+                'errors_truncated': self.failed > len(self.errors)}
+
+
+def _resolve_users(chunk, user_id):
+    if user_id is not None:
+        return {email: user_id for _, _, _, email in chunk}
+    emails = {email.lower() for _, _, _, email in chunk if email}
+    found = dict(db.session.execute(
+        db.select(db.func.lower(User.email), User.id).where(db.func.lower(User.email).in_(emails))
+    ).all()) if emails else {}
+    return {email: found.get(email.lower()) for _, _, _, email in chunk if email}
+
+
+def _import_chunk(chunk, user_id, report):
+    rows = []
+    users = _resolve_users(chunk, user_id)
+    for ref, section, data, email in chunk:
+        if section is None and 'error' in data:
+            report.error(ref, None, data['error'])
+            continue
+        model = IMPORT_MODELS.get(section)
+        if model is None:
+            report.error(ref, section, f"Unknown section '{section}'")
+            continue
+        owner = users.get(email)
+        if owner is None:
+            report.error(ref, section, f"Unknown user '{email}'" if email else 'user_email is required')
+            continue
+        try:
+            values = validate(model, data)
+        except RecordError as exc:
+            report.error(ref, section, str(exc))
+            continue
+        values['user_id'] = owner
+        rows.append((ref, section, values))
+
+    # Heading and summary are one per user; existing ones are never overwritten by an import.
+    for section in SINGLE_SECTIONS:
+        owners = {values['user_id'] for _, row_section, values in rows if row_section == section}
+        if not owners:
+            continue
+        model = IMPORT_MODELS[section]
+        taken = set(db.session.execute(db.select(model.user_id).where(model.user_id.in_(owners))).scalars())
+        kept = []
+        for ref, row_section, values in rows:
+            if row_section == section and values['user_id'] in taken:
+                report.error(ref, section, f'User already has a {section}')
+                continue
+            if row_section == section:
+                taken.add(values['user_id'])
+            kept.append((ref, row_section, values))
+        rows = kept
+
+    touched = set()
+    try:
+        for section, model in IMPORT_MODELS.items():
+            section_rows = [values for _, row_section, values in rows if row_section == section]
+            if section_rows:
+                db.session.execute(db.insert(model), section_rows)
+                analytics.apply_rows(db.session, model, section_rows)
+        db.session.commit()
+        report.imported += len(rows)
+        touched.update((values['user_id'], section) for _, section, values in rows)
+    except SQLAlchemyError:
+        # Fall back to one transaction per record so a single bad row is reported instead of losing the chunk.
+        db.session.rollback()
+        for ref, section, values in rows:
+            try:
+                db.session.execute(db.insert(IMPORT_MODELS[section]), [values])
+                analytics.apply_rows(db.session, IMPORT_MODELS[section], [values])
+                db.session.commit()
+            except SQLAlchemyError as exc:
+                db.session.rollback()
+                report.error(ref, section, str(exc.orig or exc).splitlines()[0])
+            else:
+                report.imported += 1
+                touched.add((values['user_id'], section))
+    return touched
+
+
+def import_records(records, batch_size=1000, user_id=None, max_errors=1000, on_commit=None):
+    report = ImportReport(max_errors)
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= batch_size:
+            touched = _import_chunk(chunk, user_id, report)
+            if on_commit is not None:
+                on_commit(touched)
+            chunk = []
+    if chunk:
+        touched = _import_chunk(chunk, user_id, report)
+        if on_commit is not None:
+            on_commit(touched)
+    return report
+
+
+def read_records(stream, fmt):
+    if fmt == 'csv':
+        return csv_records(stream)
+    if fmt == 'json':
+        return json_resume_records(stream)
+    raise ValueError("format must be json or csv")
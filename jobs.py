@@ -0,0 +1,185 @@
+import json
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from models import db, Job
+
+
+class JobQueue:
+    def __init__(self, app=None):
+        self.handlers = {}
+        self.periodic = {}
+        self._periodic_due = 0
+        self.processed = 0
+        self.failed = 0
+        self.dead = 0
+        self._cond = threading.Condition()
+        self._lock = threading.Lock()
+        self._threads = []
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.workers = app.config.get('JOB_WORKERS', 2)
+        self.poll_interval = app.config.get('JOB_POLL_SECONDS', 2)
+        self.max_attempts = app.config.get('JOB_MAX_ATTEMPTS', 5)
+        self.backoff = app.config.get('JOB_BACKOFF_SECONDS', 10)
+        self.lease = timedelta(seconds=app.config.get('JOB_LEASE_SECONDS', 600))
+
+    def handler(self, name):
+        def decorator(func):
+            self.handlers[name] = func
+            return func
+        return decorator
+
+    def every(self, name, seconds):
+        self.periodic[name] = seconds
+
+    def enqueue(self, name, payload=None, priority=0, delay=0, max_attempts=None, user_id=None):
+        # Lower priority values run first, so the claim query can walk the index in order.
+        if name not in self.handlers:
+            raise ValueError(f"Unknown job '{name}'")
+        job = Job(name=name, payload=json.dumps(payload or {}), priority=priority,
+                  max_attempts=max_attempts or self.max_attempts, user_id=user_id,
+                  run_at=datetime.utcnow() + timedelta(seconds=delay))
+        db.session.add(job)
+        db.session.commit()
+        with self._cond:
+            self._cond.notify()
+        return job
+
+    def start(self, workers=None):
+        with self._lock:
+            if self._threads:
+                return self._threads
+            for index in range(self.workers if workers is None else workers):
+                thread = threading.Thread(target=self._run, name=f'job-worker-{index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            return self._threads
+
+    def run_once(self):
+        with self.app.app_context():
+            job = self._claim()
+            if job is None:
+                return False
+            self._execute(job)
+            return True
+
+    def retry(self, job_ids=None):
+        query = db.update(Job).where(Job.status == 'dead')
+        if job_ids:
+            query = query.where(Job.id.in_(job_ids))
+        result = db.session.execute(query.values(status='pending', attempts=0, run_at=datetime.utcnow(),
+                                                 date_updated=datetime.utcnow()))
+        db.session.commit()
+        with self._cond:
+            self._cond.notify_all()
+        return result.rowcount
+
+    def stats(self):
+        return dict(db.session.execute(db.select(Job.status, db.func.count()).group_by(Job.status)).all())
+
+    def _run(self):
+        while True:
+            try:
+                if self.run_once():
+                    continue
+                self._recover_expired()
+                self._schedule_periodic()
+            except Exception:
+                self.app.logger.exception('Job worker failed')
+            with self._cond:
+                self._cond.wait(self.poll_interval)
+
+    def _recover_expired(self):
+        # A worker that died mid-job leaves it running; once its lease lapses the job is due again, unless it
+        # has no attempts left, since it may already have done part of its work.
+        now = datetime.utcnow()
+        with self.app.app_context():
+            expired = db.update(Job).where(Job.status == 'running', Job.locked_until < now)
+            dead = db.session.execute(expired.where(Job.attempts >= Job.max_attempts).values(
+                status='dead', locked_until=None, last_error='Lease expired', date_updated=now)).rowcount
+            db.session.execute(expired.values(status='pending', locked_until=None, date_updated=now))
+            db.session.commit()
+        with self._lock:
+            self.dead += dead
+
+    def _heartbeat(self, job_id, stop):
+        # Renews the lease while the handler runs, so only jobs whose worker is gone ever look expired.
+        while not stop.wait(self.lease.total_seconds() / 3):
+            try:
+                with self.app.app_context():
+                    db.session.execute(db.update(Job).where(Job.id == job_id, Job.status == 'running')
+                                       .values(locked_until=datetime.utcnow() + self.lease))
+                    db.session.commit()
+            except Exception:
+                self.app.logger.exception('Renewing the lease of job %s failed', job_id)
+
+    def _schedule_periodic(self):
+        # Each periodic job keeps one queued run; whichever worker finds it missing enqueues the next.
+        with self._lock:
+            if not self.periodic or time.monotonic() < self._periodic_due:
+                return
+            self._periodic_due = time.monotonic() + 60
+        with self.app.app_context():
+            for name, seconds in self.periodic.items():
+                runs = db.select(Job.id).where(Job.name == name)
+                if db.session.execute(runs.where(Job.status.in_(('pending', 'running'))).limit(1)).first():
+                    continue
+                ran = db.session.execute(runs.where(Job.status == 'done').limit(1)).first()
+                self.enqueue(name, delay=seconds if ran else 0, max_attempts=1)
+
+    def _claim(self):
+        now = datetime.utcnow()
+        candidates = db.session.execute(
+            db.select(Job.id).where(Job.status == 'pending', Job.run_at <= now)
+            .order_by(Job.priority, Job.run_at).limit(5)
+        ).scalars().all()
+        for job_id in candidates:
+            result = db.session.execute(
+                db.update(Job).where(Job.id == job_id, Job.status == 'pending')
+                .values(status='running', attempts=Job.attempts + 1, locked_until=now + self.lease, date_updated=now)
+            )
+            if result.rowcount == 1:
+                db.session.commit()
+                return db.session.get(Job, job_id)
+        db.session.commit()
+        return None
+
+    def _execute(self, job):
+        job_id, name, attempts, max_attempts = job.id, job.name, job.attempts, job.max_attempts
+        try:
+            handler = self.handlers.get(name)
+            if handler is None:
+                raise LookupError(f"No handler registered for job '{name}'")
+            stop = threading.Event()
+            threading.Thread(target=self._heartbeat, args=(job_id, stop), name=f'job-heartbeat-{job_id}',
+                             daemon=True).start()
+            try:
+                result = handler(**json.loads(job.payload))
+            finally:
+                stop.set()
+        except Exception:
+            db.session.rollback()
+            self.app.logger.exception('Job %s (%s) failed on attempt %s', job_id, name, attempts)
+            values = {'last_error': traceback.format_exc(), 'locked_until': None, 'date_updated': datetime.utcnow()}
+            if attempts >= max_attempts:
+                values['status'] = 'dead'
+            else:
+                values['status'] = 'pending'
+                values['run_at'] = datetime.utcnow() + timedelta(seconds=self.backoff * 2 ** (attempts - 1))
+            db.session.execute(db.update(Job).where(Job.id == job_id).values(**values))
+            db.session.commit()
+            with self._lock:
+                self.failed += 1
+                self.dead += values['status'] == 'dead'
+            return
+        db.session.execute(db.update(Job).where(Job.id == job_id).values(
+            status='done', result=json.dumps(result) if result is not None else None,
+            locked_until=None, date_updated=datetime.utcnow()))
+        db.session.commit()
+        with self._lock:
+            self.processed += 1
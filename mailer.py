@@ -0,0 +1,165 @@
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from flask_mail import Message
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from models import db, OutboxMessage, Lease
+
+LEASE_NAME = 'mail-outbox'
+
+
+class MailOutbox:
+    def __init__(self, mail, app=None):
+        self.mail = mail
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.batch_size = app.config.get('MAIL_OUTBOX_BATCH_SIZE', 50)
+        self.poll_interval = app.config.get('MAIL_OUTBOX_POLL_SECONDS', 5)
+        self.max_attempts = app.config.get('MAIL_OUTBOX_MAX_ATTEMPTS', 5)
+        self.backoff = app.config.get('MAIL_OUTBOX_BACKOFF_SECONDS', 30)
+        self.claim_timeout = timedelta(seconds=app.config.get('MAIL_OUTBOX_CLAIM_SECONDS', 300))
+        self.rate_per_minute = app.config.get('MAIL_RATE_PER_MINUTE', 60)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='mail-outbox', daemon=True)
+            self._thread.start()
+
+    def enqueue(self, msg):
+        db.session.add(OutboxMessage(
+            subject=msg.subject,
+            sender=msg.sender,
+            recipients=','.join(msg.recipients),
+            body=msg.body
+        ))
+        db.session.commit()
+        self._wake.set()
+
+    def drain(self):
+        sent = 0
+        with self.app.app_context():
+            # Every worker runs an outbox thread, but only the lease holder sends, so the rate is site-wide.
+            if not self._acquire_lease():
+                return 0
+            try:
+                batch = self._claim_batch()
+                if not batch:
+                    return 0
+                # One SMTP connection is reused for as long as there are claimed messages.
+                with self.mail.connect() as conn:
+                    while batch:
+                        for message in batch:
+                            sent += self._deliver(conn, message)
+                        db.session.commit()
+                        if not self._acquire_lease():
+                            break
+                        batch = self._claim_batch()
+            finally:
+                self._release_lease()
+        return sent
+
+    def _holder(self):
+        return f'{socket.gethostname()}:{os.getpid()}'
+
+    def _acquire_lease(self):
+        # Takes the lease if it is free or expired, or renews it if this process already holds it.
+        now = datetime.utcnow()
+        holder = self._holder()
+        taken = db.session.execute(
+            db.update(Lease)
+            .where(Lease.name == LEASE_NAME, or_(Lease.holder == holder, Lease.expires_at < now))
+            .values(holder=holder, expires_at=now + self.claim_timeout)
+        ).rowcount
+        if taken:
+            db.session.commit()
+            return True
+        try:
+            db.session.add(Lease(name=LEASE_NAME, holder=holder, expires_at=now + self.claim_timeout))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return False
+        return True
+
+    def _release_lease(self):
+        db.session.rollback()
+        db.session.execute(db.delete(Lease).where(Lease.name == LEASE_NAME, Lease.holder == self._holder()))
+        db.session.commit()
+
+    def _run(self):
+        while True:
+            try:
+                self.drain()
+            except Exception:
+                self.app.logger.exception('Mail outbox drain failed')
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _claim_batch(self):
+        now = datetime.utcnow()
+        candidates = OutboxMessage.query.filter(OutboxMessage.status == 'pending',
+                                                OutboxMessage.next_attempt_at <= now) \
+            .order_by(OutboxMessage.next_attempt_at) \
+            .limit(self.batch_size).all()
+        claimed = []
+        for message in candidates:
+            # Pushing next_attempt_at forward is the claim; a crashed sender's rows become due again.
+            result = db.session.execute(
+                db.update(OutboxMessage)
+                .where(OutboxMessage.id == message.id,
+                       OutboxMessage.status == 'pending',
+                       OutboxMessage.next_attempt_at == message.next_attempt_at)
+                .values(next_attempt_at=now + self.claim_timeout)
+            )
+            if result.rowcount == 1:
+                claimed.append(message.id)
+        db.session.commit()
+        if not claimed:
+            return []
+        return OutboxMessage.query.filter(OutboxMessage.id.in_(claimed)).all()
+
+    def _throttle(self):
+        # The window is read from the table, so it carries over when the lease moves to another worker.
+        while True:
+            # Committing records the previous send and starts a fresh snapshot for the count.
+            db.session.commit()
+            now = datetime.utcnow()
+            sent, oldest = db.session.execute(
+                db.select(db.func.count(), db.func.min(OutboxMessage.sent_at))
+                .where(OutboxMessage.sent_at >= now - timedelta(minutes=1))
+            ).one()
+            if sent < self.rate_per_minute:
+                return
+            time.sleep(max((oldest + timedelta(minutes=1) - now).total_seconds(), 0.01))
+
+    def _deliver(self, conn, message):
+        self._throttle()
+        try:
+            conn.send(Message(message.subject,
+                              sender=message.sender,
+                              recipients=message.recipients.split(','),
+                              body=message.body))
+        except Exception as exc:
+            message.attempts += 1
+            message.last_error = str(exc)
+            if message.attempts >= self.max_attempts:
+                message.status = 'failed'
+            else:
+                delay = self.backoff * 2 ** (message.attempts - 1)
+                message.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+            return 0
+        message.status = 'sent'
+        message.sent_at = datetime.utcnow()
+        message.attempts += 1
+        return 1
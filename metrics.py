@@ -0,0 +1,142 @@
+import cProfile
+import os
+import random
+import threading
+import time
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+
+
+class Metrics:
+    def __init__(self, app=None):
+        self._latency = {}
+        self._queries = {}
+        self._totals = {}
+        self._gauges = []
+        self._lock = threading.Lock()
+        # Only one cProfile profiler can be active per process, so sampling is serialised.
+        self._profile_lock = threading.Lock()
+        event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.profile_rate = app.config.get('PROFILE_SAMPLE_RATE', 0.0)
+        self.profile_threshold = app.config.get('PROFILE_THRESHOLD_MS', 500) / 1000
+        self.profile_dir = app.config.get('PROFILE_DIR', os.path.join(app.instance_path, 'profiles'))
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        self._wrap_json(app)
+
+    def _wrap_json(self, app):
+        dumps = app.json.dumps
+
+        def timed_dumps(obj, **kwargs):
+            started = time.perf_counter()
+            try:
+                return dumps(obj, **kwargs)
+            finally:
+                if has_request_context() and 'metrics_started' in g:
+                    g.metrics_serialize_time += time.perf_counter() - started
+        app.json.dumps = timed_dumps
+
+    def register_gauge(self, name, help_text, collect):
+        self._gauges.append((name, help_text, collect))
+
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_query_count = 0
+        g.metrics_sql_time = 0.0
+        g.metrics_serialize_time = 0.0
+        g.metrics_profiler = None
+        if self.profile_rate and random.random() < self.profile_rate and self._profile_lock.acquire(blocking=False):
+            g.metrics_profiler = cProfile.Profile()
+            g.metrics_profiler.enable()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and 'metrics_started' in g:
+            conn.info.setdefault('metrics_query_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get('metrics_query_started')
+        if started and has_request_context() and 'metrics_started' in g:
+            g.metrics_query_count += 1
+            g.metrics_sql_time += time.perf_counter() - started.pop()
+
+    def _after_request(self, response):
+        g.metrics_status = response.status_code
+        return response
+
+    def _teardown_request(self, exc):
+        if 'metrics_started' not in g:
+            return
+        elapsed = time.perf_counter() - g.metrics_started
+        endpoint = request.endpoint or 'unmatched'
+        with self._lock:
+            self._latency.setdefault(endpoint, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+            self._queries.setdefault(endpoint, Histogram(QUERY_COUNT_BUCKETS)).observe(g.metrics_query_count)
+            totals = self._totals.setdefault(endpoint, {'sql_seconds': 0.0, 'serialize_seconds': 0.0, 'errors': 0})
+            totals['sql_seconds'] += g.metrics_sql_time
+            totals['serialize_seconds'] += g.metrics_serialize_time
+            if exc is not None or g.get('metrics_status', 200) >= 500:
+                totals['errors'] += 1
+        if g.metrics_profiler is not None:
+            g.metrics_profiler.disable()
+            self._profile_lock.release()
+            if elapsed >= self.profile_threshold:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                filename = f'{endpoint}-{int(time.time() * 1000)}-{int(elapsed * 1000)}ms.prof'
+                g.metrics_profiler.dump_stats(os.path.join(self.profile_dir, filename))
+
+    def render(self):
+        lines = []
+
+        def histogram(name, help_text, histograms):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for endpoint, hist in sorted(histograms.items()):
+                for bound, count in zip(hist.buckets, hist.counts):
+                    lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="+Inf"}} {hist.total}')
+                lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {hist.sum}')
+                lines.append(f'{name}_count{{endpoint="{endpoint}"}} {hist.total}')
+
+        def counter(name, help_text, key):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for endpoint, totals in sorted(self._totals.items()):
+                lines.append(f'{name}{{endpoint="{endpoint}"}} {totals[key]}')
+
+        with self._lock:
+            histogram('http_request_duration_seconds', 'Request latency by endpoint.', self._latency)
+            histogram('db_queries_per_request', 'SQL statements executed per request.', self._queries)
+            counter('db_query_duration_seconds_total', 'Time spent executing SQL.', 'sql_seconds')
+            counter('json_serialize_duration_seconds_total', 'Time spent serializing JSON responses.', 'serialize_seconds')
+            counter('http_request_errors_total', 'Requests that raised or returned 5xx.', 'errors')
+        for name, help_text, collect in self._gauges:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {collect()}')
+        return '\n'.join(lines) + '\n'
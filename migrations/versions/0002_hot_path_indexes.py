@@ -0,0 +1,64 @@
+"""hot path indexes, reminder claims and mail outbox
+
+On MySQL the indexes are added with ALGORITHM=INPLACE, LOCK=NONE so the
+tables stay readable and writable while the index builds.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def create_index_online(name, table, columns, unique=False):
+    if op.get_bind().dialect.name == 'mysql':
+        column_list = ', '.join(f'`{column}`' for column in columns)
+        kind = 'UNIQUE INDEX' if unique else 'INDEX'
+        op.execute(f'ALTER TABLE `{table}` ADD {kind} `{name}` ({column_list}), ALGORITHM=INPLACE, LOCK=NONE')
+    else:
+        op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade():
+    op.add_column('event', sa.Column('reminder_sent', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.create_table('outbox_message',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('subject', sa.String(length=255), nullable=False),
+    sa.Column('sender', sa.String(length=120), nullable=False),
+    sa.Column('recipients', sa.Text(), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('date_created', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_message_status_next_attempt_at', 'outbox_message', ['status', 'next_attempt_at'])
+
+    create_index_online('ix_user_reset_token', 'user', ['reset_token'], unique=True)
+    create_index_online('ix_event_user_id_start_time', 'event', ['user_id', 'start_time'])
+    create_index_online('ix_event_reminder_sent_start_time', 'event', ['reminder_sent', 'start_time'])
+    create_index_online('ix_blog_user_id_date_posted', 'blog', ['user_id', 'date_posted'])
+    create_index_online('ix_review_user_id_date_posted', 'review', ['user_id', 'date_posted'])
+
+
+def downgrade():
+    op.drop_index('ix_review_user_id_date_posted', table_name='review')
+    op.drop_index('ix_blog_user_id_date_posted', table_name='blog')
+    op.drop_index('ix_event_reminder_sent_start_time', table_name='event')
+    op.drop_index('ix_event_user_id_start_time', table_name='event')
+    op.drop_index('ix_user_reset_token', table_name='user')
+    op.drop_index('ix_outbox_message_status_next_attempt_at', table_name='outbox_message')
+    op.drop_table('outbox_message')
+    with op.batch_alter_table('event') as batch_op:
+        batch_op.drop_column('reminder_sent')
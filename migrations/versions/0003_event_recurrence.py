@@ -0,0 +1,46 @@
+"""event recurrence and per-occurrence reminder claims
+
+Replaces the reminder_sent flag with reminded_start, the start time of
+the last occurrence a reminder was sent for, so recurring events can be
+reminded once per occurrence.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event') as batch_op:
+        batch_op.add_column(sa.Column('recurrence', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('series_end', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('reminded_start', sa.DateTime(), nullable=True))
+    op.execute('UPDATE event SET reminded_start = start_time WHERE reminder_sent = 1')
+    op.drop_index('ix_event_reminder_sent_start_time', table_name='event')
+    with op.batch_alter_table('event') as batch_op:
+        batch_op.drop_column('reminder_sent')
+    op.create_index('ix_event_reminded_start_start_time', 'event', ['reminded_start', 'start_time'])
+    op.create_index('ix_event_user_id_series_end', 'event', ['user_id', 'series_end'])
+
+
+def downgrade():
+    op.drop_index('ix_event_user_id_series_end', table_name='event')
+    op.drop_index('ix_event_reminded_start_start_time', table_name='event')
+    with op.batch_alter_table('event') as batch_op:
+        batch_op.add_column(sa.Column('reminder_sent', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.execute('UPDATE event SET reminder_sent = 1 WHERE reminded_start IS NOT NULL')
+    op.create_index('ix_event_reminder_sent_start_time', 'event', ['reminder_sent', 'start_time'])
+    with op.batch_alter_table('event') as batch_op:
+        batch_op.drop_column('reminded_start')
+        batch_op.drop_column('series_end')
+        batch_op.drop_column('recurrence')
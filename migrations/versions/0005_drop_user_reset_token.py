@@ -0,0 +1,31 @@
+"""drop user.reset_token
+
+Password reset tokens are signed and time-limited, carrying the user id
+and a password fingerprint, so nothing is stored when one is issued.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_user_reset_token', table_name='user')
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('reset_token')
+
+
+def downgrade():
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.add_column(sa.Column('reset_token', sa.String(length=100), nullable=True))
+    op.create_index('ix_user_reset_token', 'user', ['reset_token'], unique=True)
@@ -0,0 +1,37 @@
+"""stat rollups
+
+Per-bucket counts and sums behind the /stats endpoints, kept current by
+the write paths and rebuilt periodically by the rebuild_stats job. The
+first run of that job backfills existing rows (or run flask rebuild-stats).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'stat_rollup',
+        sa.Column('name', sa.String(length=30), nullable=False),
+        sa.Column('bucket', sa.String(length=100), nullable=False),
+        sa.Column('entries', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name', 'bucket')
+    )
+    op.create_index('ix_stat_rollup_name_entries', 'stat_rollup', ['name', 'entries'])
+
+
+def downgrade():
+    op.drop_index('ix_stat_rollup_name_entries', table_name='stat_rollup')
+    op.drop_table('stat_rollup')
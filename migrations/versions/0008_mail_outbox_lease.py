@@ -0,0 +1,39 @@
+"""outbox_message.sent_at and lease table
+
+The outbox counts sent_at over the last minute to enforce the mail rate
+across workers, and one worker at a time drains it under a lease.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('outbox_message') as batch_op:
+        batch_op.add_column(sa.Column('sent_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_outbox_message_sent_at', ['sent_at'])
+    op.create_table(
+        'lease',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('holder', sa.String(length=100), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('lease')
+    with op.batch_alter_table('outbox_message') as batch_op:
+        batch_op.drop_index('ix_outbox_message_sent_at')
+        batch_op.drop_column('sent_at')
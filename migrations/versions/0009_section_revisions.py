@@ -0,0 +1,33 @@
+"""revision counters on conditional GET sections
+
+Every UPDATE bumps revision, so the collection ETag changes even when two
+writes land in the same DATETIME second.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+TABLES = ('heading', 'education', 'professional_experience', 'skills', 'summary', 'support', 'career')
+
+
+def upgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('revision', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('revision')
@@ -1,19 +1,21 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 from flask_login import UserMixin
 from flask_bcrypt import Bcrypt
 from flask_mail import Mail
 from flask_login import LoginManager
-from flask import Flask
-
-app = Flask(__name__)
-app.config.from_object('config.Config')
-
-db = SQLAlchemy(app)
-bcrypt = Bcrypt(app)
-mail = Mail(app)
-login_manager = LoginManager(app)
-login_manager.login_view = 'login'
+from flask_migrate import Migrate
+from routing import RoutingSession
+from cache import UserCache
+
+# Extensions are bound to an app in app.create_app, so importing models never builds one.
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+migrate = Migrate()
+bcrypt = Bcrypt()
+mail = Mail()
+login_manager = LoginManager()
+login_manager.login_view = 'main.login'
 
 class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
@@ -21,7 +23,7 @@ class User(db.Model, UserMixin):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password = db.Column(db.String(60), nullable=False)
     role = db.Column(db.String(20), nullable=False, default='user')
-    reset_token = db.Column(db.String(100), nullable=True)
+    auth_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     heading = db.relationship('Heading', backref='user', uselist=False)
     educations = db.relationship('Education', backref='user', lazy=True)
     professional_experiences = db.relationship('ProfessionalExperience', backref='user', lazy=True)
@@ -32,9 +34,21 @@ class User(db.Model, UserMixin):
     reviews = db.relationship('Review', backref='user', lazy=True)
     supports = db.relationship('Support', backref='user_support', lazy=True)  # Changed backref name
 
+    def get_id(self):
+        # The version rides in the session and the remember cookie, so bumping it ends every existing login.
+        return f'{self.id}:{self.auth_version}'
+
+    def revoke_sessions(self):
+        self.auth_version = (self.auth_version or 0) + 1
+
     def __repr__(self):
         return f"User('{self.name}', '{self.email}')"
 
+@event.listens_for(User.role, 'set', active_history=True)
+def revoke_sessions_on_role_change(user, value, oldvalue, initiator):
+    if user.id is not None and oldvalue != value:
+        user.revoke_sessions()
+
 class Heading(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     first_name = db.Column(db.String(100), nullable=False)
@@ -47,6 +61,8 @@ class Heading(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     date_updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # Bumped by every UPDATE, ORM or bulk; conditional GET fingerprints it since date_updated can repeat.
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0', onupdate=db.text('revision + 1'))
 
 class Education(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -59,6 +75,7 @@ class Education(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     date_updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0', onupdate=db.text('revision + 1'))
 
 class ProfessionalExperience(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -72,6 +89,7 @@ class ProfessionalExperience(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     date_updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0', onupdate=db.text('revision + 1'))
 
 class Skills(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -80,6 +98,7 @@ class Skills(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     date_updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0', onupdate=db.text('revision + 1'))
 
 class Summary(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -87,19 +106,29 @@ class Summary(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     date_updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0', onupdate=db.text('revision + 1'))
 
 class Event(db.Model):
+    __table_args__ = (
+        db.Index('ix_event_user_id_start_time', 'user_id', 'start_time'),
+        db.Index('ix_event_reminded_start_start_time', 'reminded_start', 'start_time'),
+        db.Index('ix_event_user_id_series_end', 'user_id', 'series_end'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(150), nullable=False)
     description = db.Column(db.Text, nullable=False)
     start_time = db.Column(db.DateTime, nullable=False)
     end_time = db.Column(db.DateTime, nullable=False)
+    recurrence = db.Column(db.String(255), nullable=True)
+    series_end = db.Column(db.DateTime, nullable=True)
+    reminded_start = db.Column(db.DateTime, nullable=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
     def __repr__(self):
         return f"Event('{self.title}', '{self.start_time}')"
 
 class Blog(db.Model):
+    __table_args__ = (db.Index('ix_blog_user_id_date_posted', 'user_id', 'date_posted'),)
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(150), nullable=False)
     content = db.Column(db.Text, nullable=False)
@@ -110,6 +139,7 @@ class Blog(db.Model):
         return f"Blog('{self.title}', '{self.date_posted}')"
 
 class Review(db.Model):
+    __table_args__ = (db.Index('ix_review_user_id_date_posted', 'user_id', 'date_posted'),)
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(150), nullable=False)
     content = db.Column(db.Text, nullable=False)
@@ -127,6 +157,7 @@ class Support(db.Model):
     status = db.Column(db.String(20), nullable=False, default='Open')
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     date_updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0', onupdate=db.text('revision + 1'))
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     user = db.relationship('User', backref='support_tickets')  # Changed backref name
 
@@ -141,10 +172,73 @@ class Career(db.Model):
     location = db.Column(db.String(100), nullable=False)
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     date_updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0', onupdate=db.text('revision + 1'))
 
     def __repr__(self):
         return f"Career('{self.title}', '{self.location}')"
 
+class OutboxMessage(db.Model):
+    __table_args__ = (db.Index('ix_outbox_message_status_next_attempt_at', 'status', 'next_attempt_at'),
+                      db.Index('ix_outbox_message_sent_at', 'sent_at'))
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    sender = db.Column(db.String(120), nullable=False)
+    recipients = db.Column(db.Text, nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+    date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"OutboxMessage('{self.subject}', '{self.status}')"
+
+class Lease(db.Model):
+    # A named lock shared by every worker process; holder keeps it by renewing expires_at.
+    name = db.Column(db.String(50), primary_key=True)
+    holder = db.Column(db.String(100), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"Lease('{self.name}', '{self.holder}')"
+
+class Job(db.Model):
+    __table_args__ = (db.Index('ix_job_status_priority_run_at', 'status', 'priority', 'run_at'),)
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=False)
+    priority = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    last_error = db.Column(db.Text, nullable=True)
+    result = db.Column(db.Text, nullable=True)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = db.Column(db.DateTime, nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    date_updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"Job('{self.name}', '{self.status}')"
+
+class StatRollup(db.Model):
+    __table_args__ = (db.Index('ix_stat_rollup_name_entries', 'name', 'entries'),)
+    name = db.Column(db.String(30), primary_key=True)
+    bucket = db.Column(db.String(100), primary_key=True)
+    entries = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"StatRollup('{self.name}', '{self.bucket}', '{self.entries}')"
+
+user_cache = UserCache(db, User)
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user_id, _, version = user_id.partition(':')
+    if not version:
+        return None
+    return user_cache.load(int(user_id), int(version))
@@ -0,0 +1,88 @@
+import base64
+import json
+from datetime import datetime
+from flask import request, current_app, jsonify
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only
+
+
+class InvalidPageRequest(ValueError):
+    pass
+
+
+def encode_cursor(sort_value, last_id):
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, last_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor, sort_column):
+    try:
+        sort_value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        if sort_column.type.python_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, int(last_id)
+    except (ValueError, TypeError, NotImplementedError):
+        raise InvalidPageRequest('Invalid cursor')
+
+
+def requested_fields(serializers):
+    fields = request.args.get('fields')
+    if not fields:
+        return list(serializers)
+    fields = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in serializers]
+    if unknown:
+        raise InvalidPageRequest(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def project(query, model, fields, sort_column):
+    # Only the requested columns (plus the keyset columns) are selected, so Text bodies stay in the DB.
+    columns = {model.id, sort_column}
+    columns.update(getattr(model, field) for field in fields if field in model.__table__.c)
+    return query.options(load_only(*columns))
+
+
+def paginate(query, sort_column, id_column, descending=False):
+    default_limit = current_app.config.get('PAGE_SIZE_DEFAULT', 50)
+    max_limit = current_app.config.get('PAGE_SIZE_MAX', 200)
+    limit = request.args.get('limit', default_limit, type=int)
+    if limit < 1:
+        raise InvalidPageRequest('limit must be positive')
+    limit = min(limit, max_limit)
+
+    after = request.args.get('after')
+    if after:
+        sort_value, last_id = decode_cursor(after, sort_column)
+        if sort_column is id_column:
+            query = query.filter(id_column < last_id if descending else id_column > last_id)
+        elif descending:
+            query = query.filter(or_(sort_column < sort_value,
+                                     and_(sort_column == sort_value, id_column < last_id)))
+        else:
+            query = query.filter(or_(sort_column > sort_value,
+                                     and_(sort_column == sort_value, id_column > last_id)))
+
+    if sort_column is id_column:
+        order = [id_column.desc() if descending else id_column.asc()]
+    elif descending:
+        order = [sort_column.desc(), id_column.desc()]
+    else:
+        order = [sort_column.asc(), id_column.asc()]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
+
+
+def page_response(rows, serializers, fields, next_cursor):
+    response = jsonify(serializers.encode_many(rows, fields))
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
@@ -0,0 +1,125 @@
+import sqlite3
+import threading
+import time
+from functools import wraps
+from flask import request
+from flask_login import current_user
+from sqlitedb import setup_connection
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after):
+        super().__init__('Too many requests')
+        self.retry_after = retry_after
+
+
+def refill(tokens, updated, now, capacity, period):
+    tokens = min(capacity, tokens + (now - updated) * capacity / period)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) * period / capacity
+
+
+class MemoryBackend:
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def take(self, key, capacity, period):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, period))
+            tokens, retry_after = refill(tokens, updated, now, capacity, period)
+            self._buckets[key] = (tokens, now, period)
+            self._calls += 1
+            if self._calls % 10000 == 0:
+                self._sweep(now)
+        return retry_after
+
+    def _sweep(self, now):
+        # A bucket idle for a whole period is full again, so it can be forgotten.
+        for key, (_, updated, period) in list(self._buckets.items()):
+            if now - updated > period:
+                del self._buckets[key]
+
+
+class SQLiteBackend:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with setup_connection(path, timeout=5) as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS buckets '
+                               '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)')
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            self._local.connection = connection
+        return connection
+
+    def take(self, key, capacity, period):
+        now = time.time()
+        connection = self._connection()
+        # BEGIN IMMEDIATE serialises the read-modify-write across worker processes.
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens, retry_after = refill(tokens, updated, now, capacity, period)
+            connection.execute('INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)',
+                               (key, tokens, now))
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return retry_after
+
+
+class RateLimiter:
+    def __init__(self, app=None):
+        self.limits = {}
+        self.enabled = False
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.limits = app.config.get('RATE_LIMITS', {})
+        self.enabled = app.config.get('RATELIMIT_ENABLED', True)
+        if app.config.get('RATELIMIT_BACKEND', 'memory') == 'sqlite':
+            self.backend = SQLiteBackend(app.config['RATELIMIT_SQLITE_PATH'])
+        else:
+            self.backend = MemoryBackend()
+
+    def _scope_key(self, scope):
+        if scope == 'user' and current_user.is_authenticated:
+            return f'user:{current_user.id}'
+        if scope == 'email':
+            email = request.form.get('email')
+            return f'email:{email.strip().lower()}' if email else None
+        return f'ip:{request.remote_addr}'
+
+    def hit(self, name):
+        if not self.enabled:
+            return
+        for capacity, period, scope in self.limits.get(name, ()):
+            key = self._scope_key(scope)
+            if key is None:
+                continue
+            retry_after = self.backend.take(f'{name}:{key}', capacity, period)
+            if retry_after:
+                raise RateLimited(retry_after)
+
+    def limit(self, name, methods=('POST',)):
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method in methods:
+                    self.hit(name)
+                return view(*args, **kwargs)
+            return wrapper
+        return decorator
@@ -0,0 +1,137 @@
+import calendar
+from datetime import datetime, timedelta
+
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+MAX_COUNT = 5000
+
+
+def parse_rule(rule):
+    parts = {}
+    for part in rule.strip().upper().removeprefix('RRULE:').split(';'):
+        if not part:
+            continue
+        name, _, value = part.partition('=')
+        parts[name] = value
+
+    unknown = set(parts) - {'FREQ', 'INTERVAL', 'COUNT', 'UNTIL', 'BYDAY'}
+    if unknown:
+        raise ValueError(f"Unsupported recurrence parts: {', '.join(sorted(unknown))}")
+    if parts.get('FREQ') not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    if 'COUNT' in parts and 'UNTIL' in parts:
+        raise ValueError('COUNT and UNTIL cannot both be set')
+
+    parsed = {'freq': parts['FREQ'], 'interval': int(parts.get('INTERVAL', 1)), 'count': None, 'until': None, 'byday': None}
+    if parsed['interval'] < 1:
+        raise ValueError('INTERVAL must be positive')
+    if 'COUNT' in parts:
+        parsed['count'] = int(parts['COUNT'])
+        if not 1 <= parsed['count'] <= MAX_COUNT:
+            raise ValueError(f'COUNT must be between 1 and {MAX_COUNT}')
+    if 'UNTIL' in parts:
+        until = parts['UNTIL'].rstrip('Z')
+        parsed['until'] = datetime.strptime(until, '%Y%m%dT%H%M%S' if 'T' in until else '%Y%m%d')
+    if 'BYDAY' in parts:
+        if parsed['freq'] != 'WEEKLY':
+            raise ValueError('BYDAY is only supported with FREQ=WEEKLY')
+        days = parts['BYDAY'].split(',')
+        if any(day not in WEEKDAYS for day in days):
+            raise ValueError(f"BYDAY values must be in {', '.join(WEEKDAYS)}")
+        parsed['byday'] = sorted(WEEKDAYS.index(day) for day in set(days))
+    return parsed
+
+
+def add_months(start, months):
+    month_index = start.month - 1 + months
+    year, month = start.year + month_index // 12, month_index % 12 + 1
+    if year > datetime.max.year:
+        raise OverflowError('date value out of range')
+    if start.day > calendar.monthrange(year, month)[1]:
+        return None
+    return start.replace(year=year, month=month)
+
+
+def _candidates(start, rule, window_start):
+    # Yields (index, occurrence) in order, jumping straight to the window for fixed-step rules.
+    freq, interval = rule['freq'], rule['interval']
+    if freq in ('DAILY', 'WEEKLY') and rule['byday'] is None:
+        step = timedelta(days=interval * (7 if freq == 'WEEKLY' else 1))
+        index = max(0, (window_start - start) // step) if window_start > start else 0
+        while True:
+            yield index, start + index * step
+            index += 1
+    elif freq == 'WEEKLY':
+        days = rule['byday']
+        week_start = (start - timedelta(days=start.weekday())).replace(hour=start.hour, minute=start.minute,
+                                                                       second=start.second, microsecond=start.microsecond)
+        first_week = [day for day in days if day >= start.weekday()]
+        week = 0
+        if window_start > start:
+            week = max(0, (window_start - week_start).days // (7 * interval) - 1)
+        index = len(first_week) + (week - 1) * len(days) if week else 0
+        while True:
+            base = week_start + timedelta(weeks=week * interval)
+            for day in (first_week if week == 0 else days):
+                yield index, base + timedelta(days=day)
+                index += 1
+            week += 1
+    else:
+        months = interval * (12 if freq == 'YEARLY' else 1)
+        index = 0
+        step = 0
+        while True:
+            occurrence = add_months(start, step * months)
+            step += 1
+            if occurrence is not None:
+                yield index, occurrence
+                index += 1
+
+
+def occurrences(start, rule, window_start=None, window_end=None):
+    if isinstance(rule, str):
+        rule = parse_rule(rule)
+    window_start = window_start or start
+    try:
+        for index, occurrence in _candidates(start, rule, window_start):
+            if rule['count'] is not None and index >= rule['count']:
+                return
+            if rule['until'] is not None and occurrence > rule['until']:
+                return
+            if window_end is not None and occurrence >= window_end:
+                return
+            if occurrence >= window_start:
+                yield occurrence
+    except OverflowError:
+        # The series runs past datetime.max; there is nothing left to yield.
+        return
+
+
+def series_end(start, rule):
+    if isinstance(rule, str):
+        rule = parse_rule(rule)
+    if rule['until'] is not None:
+        return rule['until']
+    if rule['count'] is None:
+        return None
+    last_index = rule['count'] - 1
+    try:
+        if rule['freq'] in ('DAILY', 'WEEKLY') and rule['byday'] is None:
+            return start + last_index * timedelta(days=rule['interval'] * (7 if rule['freq'] == 'WEEKLY' else 1))
+        if rule['freq'] == 'WEEKLY':
+            days = rule['byday']
+            first_week = [day for day in days if day >= start.weekday()]
+            week_start = start - timedelta(days=start.weekday())
+            if last_index < len(first_week):
+                return week_start + timedelta(days=first_week[last_index])
+            week, day = divmod(last_index - len(first_week), len(days))
+            return week_start + timedelta(weeks=(week + 1) * rule['interval'], days=days[day])
+    except OverflowError:
+        raise ValueError('Recurrence runs past the supported date range')
+    # Monthly and yearly rules skip months without the start day, so they are walked; COUNT bounds the walk.
+    walked = 0
+    for last in occurrences(start, rule):
+        walked += 1
+    if walked < rule['count']:
+        raise ValueError('Recurrence runs past the supported date range')
+    return last
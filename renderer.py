@@ -0,0 +1,130 @@
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from flask import render_template
+
+
+class RenderUnavailable(Exception):
+    pass
+
+
+class RenderTimeout(Exception):
+    pass
+
+
+def html_to_pdf(html):
+    from weasyprint import HTML
+    return HTML(string=html).write_pdf()
+
+
+class ResumeRenderer:
+    def __init__(self, app=None):
+        self._pool = None
+        self._lock = threading.Lock()
+        self._written = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.cache_dir = app.config.get('RENDER_CACHE_DIR', os.path.join(app.instance_path, 'render_cache'))
+        self.pdf_workers = app.config.get('RENDER_PDF_WORKERS', 2)
+        self.pdf_timeout = app.config.get('RENDER_PDF_TIMEOUT_SECONDS', 30)
+        self.max_bytes = app.config.get('RENDER_CACHE_MAX_BYTES', 256 * 1024 * 1024)
+        self.template_dir = os.path.join(app.root_path, app.template_folder, 'resume')
+
+    def templates(self):
+        return sorted(name[:-5] for name in os.listdir(self.template_dir) if name.endswith('.html'))
+
+    def render(self, resume_data, template, fmt):
+        if template not in self.templates():
+            raise ValueError(f"Unknown template '{template}'")
+        with open(os.path.join(self.template_dir, template + '.html'), 'rb') as source:
+            template_source = source.read()
+
+        # Content-addressed: the same resume data, template source and format always map to the same file.
+        digest = hashlib.sha256()
+        digest.update(json.dumps(resume_data, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(template_source)
+        digest.update(fmt.encode('utf-8'))
+        path = os.path.join(self.cache_dir, f'{digest.hexdigest()}.{fmt}')
+        if os.path.exists(path):
+            try:
+                # Marks the file as recently used so pruning keeps it.
+                os.utime(path)
+                return path
+            except FileNotFoundError:
+                pass
+
+        html = render_template(f'resume/{template}.html', resume=resume_data)
+        if fmt == 'html':
+            output = html.encode('utf-8')
+        else:
+            pool = self._pdf_pool()
+            future = pool.submit(html_to_pdf, html)
+            try:
+                output = future.result(timeout=self.pdf_timeout)
+            except TimeoutError:
+                if not future.cancel():
+                    self._reset_pool(pool)
+                raise RenderTimeout(f'PDF rendering took longer than {self.pdf_timeout} seconds')
+            except BrokenProcessPool:
+                raise RenderTimeout('PDF rendering was interrupted while a stuck render was stopped')
+        self._write_atomic(path, output)
+        self._written += len(output)
+        if self._written > self.max_bytes // 10:
+            self._prune()
+        return path
+
+    def _pdf_pool(self):
+        if importlib.util.find_spec('weasyprint') is None:
+            raise RenderUnavailable('PDF rendering requires weasyprint')
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.pdf_workers)
+        return self._pool
+
+    def _reset_pool(self, pool):
+        # A render that already started can't be cancelled, so its pool is terminated and replaced;
+        # otherwise stuck renders would hold every worker and each later request would time out too.
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _prune(self):
+        # Least recently used files go first until the directory is back under 90% of RENDER_CACHE_MAX_BYTES.
+        # Files touched in the last minute are kept, since a response may still be about to send them.
+        self._written = 0
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        recent = time.time() - 60
+        for mtime, size, path in sorted(files):
+            if total <= self.max_bytes * 0.9 or mtime > recent:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _write_atomic(self, path, output):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(output)
+        os.replace(tmp_path, path)
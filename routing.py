@@ -0,0 +1,49 @@
+import random
+import time
+from flask import request, session, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get('replica')
+        if replica is not None and bind is None and not self._flushing:
+            return self._db.engines[replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_keys(app):
+    return sorted(key for key in app.config.get('SQLALCHEMY_BINDS') or {} if key.startswith('replica_'))
+
+
+def init_replica_routing(app, db):
+    keys = replica_keys(app)
+    sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', 5)
+    if not keys:
+        return
+
+    @app.before_request
+    def route_reads():
+        # Reads go to a replica unless this client wrote recently and the replica may not have caught up.
+        if request.method in READ_METHODS and session.get('primary_until', 0) <= time.time():
+            db.session.info['replica'] = random.choice(keys)
+
+    @event.listens_for(db.session, 'after_flush')
+    def mark_write(db_session, flush_context):
+        db_session.info['wrote'] = True
+
+    @event.listens_for(db.session, 'do_orm_execute')
+    def mark_statement_write(orm_execute_state):
+        # Bulk and Core DML through session.execute never flushes, so /batch, imports and jobs are caught here.
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            orm_execute_state.session.info['wrote'] = True
+
+    @event.listens_for(db.session, 'after_commit')
+    def stick_to_primary(db_session):
+        if db_session.info.pop('wrote', False):
+            db_session.info.pop('replica', None)
+            if has_request_context():
+                session['primary_until'] = time.time() + sticky_seconds
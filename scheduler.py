@@ -0,0 +1,132 @@
+import heapq
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
+from models import db, Event
+from recurrence import occurrences
+
+
+class ReminderScheduler:
+    def __init__(self, send_reminder, app=None):
+        self.send_reminder = send_reminder
+        self._heap = []
+        self._planned = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.lead = timedelta(minutes=app.config.get('REMINDER_LEAD_MINUTES', 30))
+        self.rescan_interval = app.config.get('REMINDER_RESCAN_SECONDS', 60)
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            # The thread only counts as started once the initial rescan succeeded; otherwise the next request retries.
+            try:
+                self._rescan()
+            except Exception:
+                self.app.logger.exception('Initial reminder rescan failed')
+                return
+            self._thread = threading.Thread(target=self._run, name='reminder-scheduler', daemon=True)
+            self._thread.start()
+
+    def next_occurrence(self, event, after):
+        if event.reminded_start is not None and event.reminded_start > after:
+            after = event.reminded_start
+        if not event.recurrence:
+            return event.start_time if event.start_time > after else None
+        return next(occurrences(event.start_time, event.recurrence, after + timedelta(microseconds=1)), None)
+
+    def plan(self, event):
+        occurrence = self.next_occurrence(event, datetime.utcnow())
+        with self._cond:
+            if occurrence is None:
+                self._planned.pop(event.id, None)
+                return
+            if self._planned.get(event.id) == occurrence:
+                return
+            self._planned[event.id] = occurrence
+            heapq.heappush(self._heap, (occurrence - self.lead, event.id, occurrence))
+            self._cond.notify()
+
+    def cancel(self, event_id):
+        with self._cond:
+            self._planned.pop(event_id, None)
+
+    def _rescan(self):
+        # Picks up events created by other workers and rebuilds the heap after a restart.
+        now = datetime.utcnow()
+        horizon = now + self.lead + timedelta(seconds=self.rescan_interval)
+        with self.app.app_context():
+            single = Event.query.filter(Event.recurrence.is_(None),
+                                        Event.reminded_start.is_(None),
+                                        Event.start_time > now,
+                                        Event.start_time <= horizon)
+            recurring = Event.query.filter(Event.recurrence.isnot(None),
+                                           Event.start_time <= horizon,
+                                           or_(Event.series_end.is_(None), Event.series_end > now))
+            for event in single.union_all(recurring):
+                self.plan(event)
+
+    def _run(self):
+        next_rescan = datetime.utcnow() + timedelta(seconds=self.rescan_interval)
+        while True:
+            due = []
+            with self._cond:
+                now = datetime.utcnow()
+                while self._heap and self._heap[0][0] <= now:
+                    remind_at, event_id, occurrence = heapq.heappop(self._heap)
+                    if self._planned.get(event_id) == occurrence:
+                        del self._planned[event_id]
+                        due.append((event_id, occurrence))
+                if not due:
+                    wake_at = next_rescan
+                    if self._heap and self._heap[0][0] < wake_at:
+                        wake_at = self._heap[0][0]
+                    self._cond.wait(max((wake_at - now).total_seconds(), 0))
+            for event_id, occurrence in due:
+                self._fire(event_id, occurrence)
+            if datetime.utcnow() >= next_rescan:
+                try:
+                    self._rescan()
+                except Exception:
+                    self.app.logger.exception('Reminder rescan failed')
+                next_rescan = datetime.utcnow() + timedelta(seconds=self.rescan_interval)
+
+    def _claim(self, event_id, occurrence):
+        # Conditional update so only one worker wins the reminder for this occurrence.
+        result = db.session.execute(
+            db.update(Event)
+            .where(Event.id == event_id,
+                   or_(Event.reminded_start.is_(None), Event.reminded_start < occurrence))
+            .values(reminded_start=occurrence)
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    def _is_occurrence(self, event, occurrence):
+        if not event.recurrence:
+            return event.start_time == occurrence
+        return next(occurrences(event.start_time, event.recurrence, occurrence, occurrence + timedelta(microseconds=1)),
+                    None) == occurrence
+
+    def _fire(self, event_id, occurrence):
+        with self.app.app_context():
+            try:
+                event = Event.query.options(joinedload(Event.user)).filter_by(id=event_id).first()
+                if event is None or not self._is_occurrence(event, occurrence):
+                    return
+                if not self._claim(event_id, occurrence):
+                    return
+                db.session.refresh(event)
+                self.send_reminder(event, occurrence)
+                if event.recurrence:
+                    self.plan(event)
+            except Exception:
+                db.session.rollback()
+                self.app.logger.exception('Failed to send reminder for event %s', event_id)
@@ -0,0 +1,123 @@
+import re
+import sqlite3
+import threading
+import warnings
+from sqlalchemy import event
+from sqlitedb import setup_connection
+
+
+class SearchIndex:
+    def __init__(self, path=None):
+        self._local = threading.local()
+        if path is not None:
+            self.open(path)
+
+    def init_app(self, app):
+        self.open(app.config['SEARCH_INDEX_PATH'])
+
+    def open(self, path):
+        self.path = path
+        with setup_connection(path, timeout=10) as connection:
+            columns = [row[1] for row in connection.execute('PRAGMA table_info(documents)')]
+            keyed = connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'document_keys'").fetchone()
+            if columns and ('scope' not in columns or not keyed):
+                connection.execute('DROP TABLE documents')
+                warnings.warn(f'Search index at {path} had the old schema and was emptied; run flask reindex-search')
+            # scope is an indexed token (u<user_id> or public), so MATCH narrows to the caller's documents
+            # before ranking instead of ranking every user's matches and filtering afterwards.
+            connection.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5(
+                    kind UNINDEXED, ref_id UNINDEXED, scope, title, body,
+                    tokenize = 'porter unicode61', prefix = '2 3'
+                )
+            ''')
+            # FTS5 cannot index kind/ref_id, so this maps them to the document rowid and writes delete by rowid
+            # instead of scanning the whole index.
+            connection.execute('''
+                CREATE TABLE IF NOT EXISTS document_keys (
+                    kind TEXT NOT NULL, ref_id INTEGER NOT NULL, docid INTEGER NOT NULL,
+                    PRIMARY KEY (kind, ref_id)
+                ) WITHOUT ROWID
+            ''')
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def _docid(self, connection, kind, ref_id):
+        row = connection.execute('SELECT docid FROM document_keys WHERE kind = ? AND ref_id = ?',
+                                 (kind, ref_id)).fetchone()
+        return row[0] if row else None
+
+    def upsert(self, kind, ref_id, user_id, title, body):
+        connection = self._connection()
+        with connection:
+            docid = self._docid(connection, kind, ref_id)
+            if docid is not None:
+                connection.execute('DELETE FROM documents WHERE rowid = ?', (docid,))
+            cursor = connection.execute(
+                'INSERT INTO documents (rowid, kind, ref_id, scope, title, body) VALUES (?, ?, ?, ?, ?, ?)',
+                (docid, kind, ref_id, 'public' if user_id is None else f'u{user_id}', title, body))
+            if docid is None:
+                connection.execute('INSERT INTO document_keys (kind, ref_id, docid) VALUES (?, ?, ?)',
+                                   (kind, ref_id, cursor.lastrowid))
+
+    def remove(self, kind, ref_id):
+        connection = self._connection()
+        with connection:
+            docid = self._docid(connection, kind, ref_id)
+            if docid is not None:
+                connection.execute('DELETE FROM documents WHERE rowid = ?', (docid,))
+                connection.execute('DELETE FROM document_keys WHERE kind = ? AND ref_id = ?', (kind, ref_id))
+
+    def clear(self):
+        connection = self._connection()
+        with connection:
+            connection.execute('DELETE FROM documents')
+            connection.execute('DELETE FROM document_keys')
+
+    def search(self, query, user_id, kinds, limit=20):
+        terms = re.findall(r'\w+', query)
+        if not terms:
+            return []
+        # Every term is quoted (no FTS syntax injection), prefix-matched and limited to title and body.
+        scopes = [f'u{int(user_id)}'] + (['public'] if 'career' in kinds else [])
+        match = 'scope : (%s) AND {title body} : (%s)' % (' OR '.join(scopes), ' '.join('"%s"*' % term for term in terms))
+        placeholders = ', '.join('?' for _ in kinds)
+        rows = self._connection().execute(f'''
+            SELECT kind, ref_id, title, snippet(documents, 4, '[', ']', '...', 12), bm25(documents, 0, 0, 0, 5.0, 1.0)
+            FROM documents
+            WHERE documents MATCH ? AND kind IN ({placeholders})
+            ORDER BY 5
+            LIMIT ?
+        ''', [match, *kinds, limit]).fetchall()
+        return [{'kind': kind, 'id': int(ref_id), 'title': title, 'snippet': snippet, 'score': -score}
+                for kind, ref_id, title, snippet, score in rows]
+
+    def index_on_commit(self, session, documents):
+        # documents maps a model to a function returning (user_id, title, body) for an instance.
+        @event.listens_for(session, 'after_flush')
+        def collect(session, flush_context):
+            pending = session.info.setdefault('search_updates', {})
+            for instance in list(session.new) + list(session.dirty):
+                if type(instance) in documents:
+                    pending[(type(instance), instance.id)] = documents[type(instance)](instance)
+            for instance in session.deleted:
+                if type(instance) in documents:
+                    pending[(type(instance), instance.id)] = None
+
+        @event.listens_for(session, 'after_commit')
+        def apply(session):
+            for (model, ref_id), document in session.info.pop('search_updates', {}).items():
+                if document is None:
+                    self.remove(model.__tablename__, ref_id)
+                else:
+                    self.upsert(model.__tablename__, ref_id, *document)
+
+        @event.listens_for(session, 'after_rollback')
+        def discard(session):
+            session.info.pop('search_updates', None)
@@ -0,0 +1,15 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+
+@contextmanager
+def setup_connection(path, timeout):
+    # A throwaway connection, so a preloaded master never hands an open handle to forked workers.
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    connection = sqlite3.connect(path, timeout=timeout)
+    try:
+        with connection:
+            yield connection
+    finally:
+        connection.close()
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    import config
+    from app import create_app
+    from models import db
+
+    def make(**overrides):
+        settings = {
+            'TESTING': True,
+            'SECRET_KEY': 'test',
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'site.db'),
+            'SQLALCHEMY_BINDS': {},
+            'SEARCH_INDEX_PATH': str(tmp_path / 'search_index.db'),
+            'RENDER_CACHE_DIR': str(tmp_path / 'render_cache'),
+            'RATELIMIT_ENABLED': False,
+            'JOB_WORKERS': 0,
+            'WTF_CSRF_ENABLED': False,
+        }
+        settings.update(overrides)
+        app = create_app(type('TestConfig', (config.Config,), settings))
+        with app.app_context():
+            db.create_all()
+        return app
+
+    return make
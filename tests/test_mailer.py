@@ -0,0 +1,107 @@
+import socketserver
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from flask_mail import Message
+
+from app import mail_outbox
+from models import db, Lease, OutboxMessage
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    # Just enough SMTP for smtplib: every command succeeds unless the server was told to refuse recipients.
+    def handle(self):
+        self.server.connections += 1
+        self.wfile.write(b'220 localhost\r\n')
+        for line in self.rfile:
+            command = line[:4].upper()
+            if command == b'DATA':
+                self.wfile.write(b'354 End data with <CR><LF>.<CR><LF>\r\n')
+                self.server.messages.append(b''.join(iter(self.rfile.readline, b'.\r\n')))
+                self.wfile.write(b'250 OK\r\n')
+            elif command == b'RCPT' and self.server.refuse:
+                self.wfile.write(b'550 No such user\r\n')
+            elif command == b'QUIT':
+                self.wfile.write(b'221 Bye\r\n')
+                return
+            else:
+                self.wfile.write(b'250 localhost\r\n')
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), SMTPHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.messages = []
+    server.refuse = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def app(make_app, smtp_server):
+    return make_app(MAIL_SERVER='127.0.0.1', MAIL_PORT=smtp_server.server_address[1], MAIL_USE_TLS=False,
+                    MAIL_USERNAME=None, MAIL_PASSWORD=None, MAIL_SUPPRESS_SEND=False, MAIL_RATE_PER_MINUTE=2)
+
+
+def enqueue(app, count):
+    with app.app_context():
+        for index in range(count):
+            mail_outbox.enqueue(Message(f'Message {index}', sender='noreply@example.com',
+                                        recipients=['user@example.com'], body='Hello'))
+
+
+def test_drain_sends_the_batch_over_one_connection(app, smtp_server):
+    enqueue(app, 2)
+    assert mail_outbox.drain() == 2
+    assert smtp_server.connections == 1
+    assert len(smtp_server.messages) == 2
+    with app.app_context():
+        assert {message.status for message in OutboxMessage.query} == {'sent'}
+        assert all(message.sent_at is not None for message in OutboxMessage.query)
+        assert db.session.get(Lease, 'mail-outbox') is None
+
+
+def test_rate_counts_messages_sent_by_other_workers(app, smtp_server):
+    with app.app_context():
+        sent_at = datetime.utcnow() - timedelta(seconds=59)
+        for _ in range(2):
+            db.session.add(OutboxMessage(subject='Earlier', sender='noreply@example.com',
+                                         recipients='user@example.com', body='Hello', status='sent',
+                                         sent_at=sent_at))
+        db.session.commit()
+    enqueue(app, 1)
+    started = time.monotonic()
+    assert mail_outbox.drain() == 1
+    assert time.monotonic() - started >= 0.5
+
+
+def test_only_the_lease_holder_drains(app, smtp_server):
+    with app.app_context():
+        db.session.add(Lease(name='mail-outbox', holder='other-host:1',
+                             expires_at=datetime.utcnow() + timedelta(minutes=5)))
+        db.session.commit()
+    enqueue(app, 1)
+    assert mail_outbox.drain() == 0
+    assert smtp_server.messages == []
+
+    with app.app_context():
+        db.session.get(Lease, 'mail-outbox').expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+    assert mail_outbox.drain() == 1
+
+
+def test_failed_send_is_retried_with_backoff(app, smtp_server):
+    smtp_server.refuse = True
+    enqueue(app, 1)
+    assert mail_outbox.drain() == 0
+    with app.app_context():
+        message = OutboxMessage.query.one()
+        assert (message.status, message.attempts, message.sent_at) == ('pending', 1, None)
+        assert message.next_attempt_at > datetime.utcnow()
+        assert 'No such user' in message.last_error
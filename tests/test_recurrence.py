@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from recurrence import MAX_COUNT, occurrences, parse_rule, series_end
+
+
+def brute_force(start, rule, limit):
+    # Walks day by day, which is slow but obviously right for DAILY and WEEKLY rules.
+    rule = parse_rule(rule)
+    step_days = 7 if rule['freq'] == 'WEEKLY' else 1
+    week_start = start - timedelta(days=start.weekday())
+    found = []
+    day = start
+    while len(found) < limit:
+        if rule['until'] is not None and day > rule['until']:
+            break
+        if rule['byday'] is not None:
+            week = (day - week_start).days // 7
+            if week % rule['interval'] == 0 and day.weekday() in rule['byday']:
+                found.append(day)
+        elif (day - start).days % (step_days * rule['interval']) == 0:
+            found.append(day)
+        if rule['count'] is not None and len(found) == rule['count']:
+            break
+        day += timedelta(days=1)
+    return found
+
+
+@pytest.mark.parametrize('rule', [
+    'FREQ=DAILY;COUNT=10',
+    'FREQ=DAILY;INTERVAL=3;COUNT=25',
+    'FREQ=WEEKLY;INTERVAL=2;COUNT=12',
+    'FREQ=WEEKLY;BYDAY=MO,WE,FR;COUNT=20',
+    'FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,SU;COUNT=15',
+    'FREQ=WEEKLY;INTERVAL=3;BYDAY=MO;COUNT=7',
+    'FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR,SA,SU;UNTIL=20260301T090000',
+])
+def test_daily_and_weekly_match_brute_force(rule):
+    start = datetime(2026, 1, 7, 9, 0)  # a Wednesday
+    expected = brute_force(start, rule, 1000)
+    assert list(occurrences(start, rule)) == expected
+    assert series_end(start, rule) == expected[-1]
+
+
+@pytest.mark.parametrize('rule', [
+    'FREQ=DAILY;INTERVAL=3',
+    'FREQ=WEEKLY;INTERVAL=2',
+    'FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE,FR',
+    'FREQ=WEEKLY;BYDAY=TU;COUNT=40',
+])
+def test_window_jump_matches_full_expansion(rule):
+    start = datetime(2026, 1, 7, 9, 0)
+    expected = brute_force(start, rule, 400)
+    for window_start in (datetime(2026, 1, 7), datetime(2026, 3, 1), datetime(2026, 6, 15, 9, 0)):
+        window_end = window_start + timedelta(days=31)
+        assert list(occurrences(start, rule, window_start, window_end)) == \
+            [day for day in expected if window_start <= day < window_end]
+
+
+def test_count_limits_occurrences_inside_a_later_window():
+    start = datetime(2026, 1, 1, 9, 0)
+    assert list(occurrences(start, 'FREQ=DAILY;COUNT=5', datetime(2026, 1, 4), datetime(2026, 2, 1))) == \
+        [datetime(2026, 1, 4, 9, 0), datetime(2026, 1, 5, 9, 0)]
+    assert list(occurrences(start, 'FREQ=DAILY;COUNT=5', datetime(2026, 1, 6), datetime(2026, 2, 1))) == []
+
+
+def test_until_is_inclusive():
+    start = datetime(2026, 1, 1, 9, 0)
+    assert list(occurrences(start, 'FREQ=DAILY;UNTIL=20260103T090000'))[-1] == datetime(2026, 1, 3, 9, 0)
+    assert list(occurrences(start, 'FREQ=DAILY;UNTIL=20260103T085959'))[-1] == datetime(2026, 1, 2, 9, 0)
+    assert series_end(start, 'FREQ=DAILY;UNTIL=20260103') == datetime(2026, 1, 3)
+
+
+def test_monthly_skips_months_without_the_start_day():
+    start = datetime(2026, 1, 31, 9, 0)
+    assert [day.month for day in occurrences(start, 'FREQ=MONTHLY;COUNT=7')] == [1, 3, 5, 7, 8, 10, 12]
+    assert series_end(start, 'FREQ=MONTHLY;COUNT=3') == datetime(2026, 5, 31, 9, 0)
+    assert [day.month for day in occurrences(start, 'FREQ=MONTHLY;INTERVAL=2;COUNT=3')] == [1, 3, 5]
+
+
+def test_yearly_leap_day_only_lands_on_leap_years():
+    start = datetime(2024, 2, 29)
+    assert [day.year for day in occurrences(start, 'FREQ=YEARLY;COUNT=3')] == [2024, 2028, 2032]
+
+
+def test_series_stops_at_the_end_of_the_supported_range():
+    assert list(occurrences(datetime(9999, 12, 29), 'FREQ=DAILY'))[-1] == datetime(9999, 12, 31)
+    assert list(occurrences(datetime(9999, 10, 15), 'FREQ=MONTHLY')) == \
+        [datetime(9999, 10, 15), datetime(9999, 11, 15), datetime(9999, 12, 15)]
+    assert list(occurrences(datetime(9999, 12, 27), 'FREQ=WEEKLY;BYDAY=MO,FR')) == \
+        [datetime(9999, 12, 27), datetime(9999, 12, 31)]
+
+
+@pytest.mark.parametrize('start, rule', [
+    (datetime(9999, 12, 29), 'FREQ=DAILY;COUNT=5'),
+    (datetime(9999, 12, 27), 'FREQ=WEEKLY;BYDAY=MO,FR;COUNT=3'),
+    (datetime(9999, 11, 15), 'FREQ=MONTHLY;COUNT=5'),
+    (datetime(9990, 1, 1), 'FREQ=YEARLY;COUNT=20'),
+])
+def test_series_end_rejects_counts_past_the_supported_range(start, rule):
+    with pytest.raises(ValueError):
+        series_end(start, rule)
+
+
+def test_open_ended_rule_has_no_series_end():
+    assert series_end(datetime(2026, 1, 1), 'FREQ=WEEKLY;BYDAY=MO') is None
+
+
+@pytest.mark.parametrize('rule', [
+    'FREQ=HOURLY',
+    'FREQ=DAILY;COUNT=0',
+    f'FREQ=DAILY;COUNT={MAX_COUNT + 1}',
+    'FREQ=DAILY;INTERVAL=0',
+    'FREQ=DAILY;COUNT=3;UNTIL=20260101',
+    'FREQ=MONTHLY;BYDAY=MO',
+    'FREQ=WEEKLY;BYDAY=XX',
+    'FREQ=DAILY;BYMONTH=1',
+])
+def test_parse_rule_rejects_unsupported_rules(rule):
+    with pytest.raises(ValueError):
+        parse_rule(rule)
@@ -0,0 +1,27 @@
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+
+
+class ResetTokens:
+    def __init__(self, db, model, app=None):
+        self.db = db
+        self.model = model
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_age = app.config.get('RESET_TOKEN_MAX_AGE_SECONDS', 3600)
+        self.serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt='password-reset')
+
+    def issue(self, user):
+        # The reset bumps auth_version (User.revoke_sessions), so a token works once and older ones die with it.
+        return self.serializer.dumps([user.id, user.auth_version])
+
+    def verify(self, token):
+        try:
+            user_id, version = self.serializer.loads(token, max_age=self.max_age)
+        except (BadSignature, TypeError, ValueError):
+            return None
+        user = self.db.session.get(self.model, user_id)
+        if user is None or user.auth_version != version:
+            return None
+        return user